@@ -1,14 +1,27 @@
+import time
+T_INICIO = time.perf_counter()
+
+import os
 import sys
-import cv2
 
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
 
-from engine.cv_engine import process_frame
+from engine.capture import CaptureConfig, open_capture
+from engine.cv_engine import process_frame, shutdown as shutdown_engine
 from engine.game_logic import GameState
+from engine.log import get_logger
+from engine.models import registry
+from engine.pipeline import CVPipeline
+from engine.profiler import profiler
 from ui_qt.main_window import MainWindow
 
 
+log = get_logger("app")
+
+# FPS do preview da câmera, independente da inferência (ex.: 15 em máquina fraca; 0 desliga)
+PREVIEW_FPS = float(os.environ.get("GIFT_PREVIEW_FPS", 30))
+
 fases = [
     {"nome": "prologo", "tipo": "video", "arquivo": "assets/ney3.mp4"},
     {"nome": "alianca", "tipo": "gesto_duplo", "gestos": ["A", "B"]},
@@ -24,44 +37,82 @@ game = GameState(fases)
 window = MainWindow(game)
 window.showFullScreen()
 
-cap = cv2.VideoCapture(0)
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
-if not cap.isOpened():
-    print("❌ Câmera não abriu")
-    sys.exit(1)
+def ms_desde_inicio():
+    return (time.perf_counter() - T_INICIO) * 1000.0
 
-frame_count = 0
+
+log.info("[STARTUP] Janela criada em %.0f ms", ms_desde_inicio())
+
+# Webcam em MJPG 640x480@30 (ajustável por GIFT_CAMERA*, ver engine/capture.py)
+cap, cam_info = open_capture(CaptureConfig.from_env())
+if cap is None:
+    log.error("❌ Câmera não abriu")
+    sys.exit(1)
+log.info("[STARTUP] Câmera aberta em %.0f ms", ms_desde_inicio())
 
 # Inicia menu (looping do prólogo ou imagem)
 window.video.play_file(fases[0]["arquivo"], loop=True)
 
-def tick():
-    global frame_count
 
-    ok, frame = cap.read()
-    if not ok:
+class PipelineBridge(QObject):
+    """Leva o aviso de resultado novo da thread de inferência para a GUI"""
+    resultado_pronto = Signal()
+    modelos_prontos = Signal(bool)
+
+
+def on_resultado():
+    packet = pipeline.poll_result()
+    if packet is None:
         return
 
-    dados = process_frame(frame, frame_count)
-    frame_count += 1
+    dados = packet.dados
+    with profiler.stage("game_update"):
+        evento = game.update(
+            dados.get("gesto0"),
+            dados.get("gesto1"),
+            dados.get("objetos", [])
+        )
+
+    with profiler.stage("update_state"):
+        window.update_state(game, dados, evento)
+
+def processar(frame, frame_count, ts):
+    # Só roda os detectores que a fase atual precisa (thread de inferência)
+    return process_frame(frame, frame_count, ts, game.detectores_necessarios())
+
+def on_modelos_prontos(ok):
+    log.info("[STARTUP] Modelos prontos em %.0f ms (%s)", ms_desde_inicio(), registry.format_timings())
+    window.set_models_ready(ok)
+
+bridge = PipelineBridge()
+bridge.resultado_pronto.connect(on_resultado, Qt.QueuedConnection)
+bridge.modelos_prontos.connect(on_modelos_prontos, Qt.QueuedConnection)
+
+pipeline = CVPipeline(
+    cap, processar,
+    on_result=bridge.resultado_pronto.emit,
+    preview_size=window.cam_preview_size()
+)
+pipeline.start()
+window.start_cam_preview(pipeline.latest_frame, PREVIEW_FPS)
 
-    evento = game.update(
-        dados.get("gesto0"),
-        dados.get("gesto1"),
-        dados.get("objetos", [])
-    )
+# Menu e câmera já estão na tela; MediaPipe, classificador e YOLO carregam em background
+registry.start_background(on_ready=bridge.modelos_prontos.emit)
+QTimer.singleShot(0, lambda: log.info("[STARTUP] Menu na tela em %.0f ms", ms_desde_inicio()))
 
-    window.update_state(game, dados, frame, evento)
+def report_stats():
+    log.info("[PIPELINE] %s", pipeline.format_report())
 
-timer = QTimer()
-timer.timeout.connect(tick)
-timer.start(33)
+stats_timer = QTimer()
+stats_timer.timeout.connect(report_stats)
+stats_timer.start(5000)
 
 def cleanup():
+    pipeline.stop()
+    shutdown_engine()
+    window.video.shutdown()
     cap.release()
 
 app.aboutToQuit.connect(cleanup)
-sys.exit(app.exec())
\ No newline at end of file
+sys.exit(app.exec())
@@ -0,0 +1,110 @@
+# ===================== Benchmark offline do engine =======================
+#
+# Passa vídeos gravados por engine.cv_engine.CVEngine + GameState.update
+# sem câmera e sem janela, e mede throughput, percentis por estágio e memória.
+# O YOLO roda síncrono dentro do process_frame (todo frame), então o tempo
+# dele entra no process_frame e as detecções não dependem da velocidade da CPU.
+#
+#   python bench-replay.py                                  # assets/*.mp4
+#   python bench-replay.py sessao.mp4 --out bench/atual.json
+#   python bench-replay.py --save-baseline bench/baseline.json
+#   python bench-replay.py --baseline bench/baseline.json   # sai com 1 se regrediu
+#   python bench-replay.py --modo image --sem-roi           # compara com/sem o recorte das mãos
+#
+
+import argparse
+import glob
+import json
+import os
+
+from engine.game_logic import GameState
+from engine.replay import replay, compare
+
+
+# Fases cíclicas só para exercitar o GameState.update durante o replay
+FASES_BENCH = [
+    {"nome": "bench_duplo", "tipo": "gesto_duplo", "gestos": ["A", "B"]},
+    {"nome": "bench_objeto", "tipo": "objeto", "objeto": "cat"},
+    {"nome": "bench_unico", "tipo": "gesto_unico", "gesto": "A"},
+]
+
+
+class BenchGameState(GameState):
+    """GameState já fora do menu e que recomeça ao terminar as fases"""
+    def __init__(self, fases):
+        super().__init__(fases)
+        self.menu_active = False
+        self.fase_atual = 0
+
+    def update(self, g0, g1, objetos=None):
+        if self.fase_atual >= len(self.fases):
+            self.fase_atual = 0
+        return super().update(g0, g1, objetos)
+
+
+def imprimir(r):
+    mem = r["memoria"]
+    print(f"\n== {r['clipe']}: {r['frames']} frames em {r['tempo_s']:.1f}s "
+          f"→ {r['throughput_fps']:.1f} fps | RSS pico {mem['rss_pico_mb']:.0f} MB")
+    print(f"   {'estágio':<16}{'p50':>8}{'p95':>8}{'p99':>8}{'máx':>8}")
+    for nome, st in r["stages"].items():
+        print(f"   {nome:<16}{st['p50_ms']:>8.2f}{st['p95_ms']:>8.2f}{st['p99_ms']:>8.2f}{st['max_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("clipes", nargs="*", help="vídeos (padrão: assets/*.mp4)")
+    parser.add_argument("--frames", type=int, default=None, help="máximo de frames por clipe")
+    parser.add_argument("--modo", choices=["image", "video", "live_stream"], default=None,
+                        help="modo do HandLandmarker (padrão: o do engine)")
+    parser.add_argument("--sem-roi", action="store_true",
+                        help="MediaPipe sempre no frame inteiro (o recorte só vale no modo image)")
+    parser.add_argument("--out", help="salva o relatório em JSON")
+    parser.add_argument("--save-baseline", help="salva o relatório como baseline")
+    parser.add_argument("--baseline", help="compara com um baseline salvo")
+    parser.add_argument("--tolerancia", type=float, default=0.10)
+    args = parser.parse_args()
+
+    clipes = args.clipes or sorted(glob.glob("assets/*.mp4"))
+    if not clipes:
+        raise SystemExit("Nenhum clipe para rodar")
+
+    from engine.cv_engine import CVEngine, HAND_RUNNING_MODE
+    from engine.profiler import Profiler
+
+    modo = args.modo or HAND_RUNNING_MODE
+    relatorio = {"modo": modo, "roi": not args.sem_roi, "clipes": {}}
+    with CVEngine(running_mode=modo, hand_roi=not args.sem_roi, yolo_sincrono=True,
+                  profiler=Profiler()) as engine:
+        for clipe in clipes:
+            engine.reset()
+            r = replay(clipe, lambda frame, idx, ts: engine.process(frame, ts), BenchGameState(FASES_BENCH), args.frames,
+                       profiler=engine.profiler)
+            relatorio["clipes"][clipe] = r
+            imprimir(r)
+
+    for destino in (args.out, args.save_baseline):
+        if destino:
+            os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+            with open(destino, "w") as f:
+                json.dump(relatorio, f, indent=2)
+            print(f"\nRelatório salvo em {destino}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regrediu = False
+        print(f"\n== Comparando com {args.baseline} (tolerância {args.tolerancia:.0%})")
+        for clipe, r in relatorio["clipes"].items():
+            base = baseline["clipes"].get(clipe)
+            if base is None:
+                print(f"   {clipe}: sem baseline")
+                continue
+            regressoes = compare(r, base, args.tolerancia)
+            for metrica, antes, depois in regressoes:
+                print(f"   ✗ {clipe} {metrica}: {antes:.2f} → {depois:.2f}")
+            if not regressoes:
+                print(f"   ✓ {clipe} ({base['throughput_fps']:.1f} → {r['throughput_fps']:.1f} fps)")
+            regrediu = regrediu or bool(regressoes)
+        if regrediu:
+            raise SystemExit(1)
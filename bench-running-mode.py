@@ -0,0 +1,64 @@
+# ===================== Benchmark dos modos do HandLandmarker =======================
+#
+# Compara o FPS do MediaPipe em IMAGE (detecção completa por frame) contra
+# VIDEO / LIVE_STREAM (rastreamento entre frames) usando o mesmo vídeo.
+# Em LIVE_STREAM o MediaPipe descarta frames quando está ocupado, então o FPS
+# medido é o de submissão; "frames com mãos" mostra quantos resultados chegaram.
+#
+#   python bench-running-mode.py assets/prolog.mp4
+#   python bench-running-mode.py 0 --frames 300      # webcam
+#
+
+import argparse
+import time
+
+import cv2
+
+from engine.hand_landmarker import HandDetector, RUNNING_MODES
+
+
+def carregar_frames(fonte, max_frames):
+    """Decodifica tudo antes, para medir só o MediaPipe"""
+    cap = cv2.VideoCapture(int(fonte) if fonte.isdigit() else fonte)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames, fps
+
+
+def rodar(modo, frames, fps):
+    detector = HandDetector(modo, num_hands=2)
+    com_maos = 0
+    t0 = time.perf_counter()
+    for i, rgb in enumerate(frames):
+        # Timestamps do próprio stream, como viriam da captura
+        resultado = detector.detect(rgb, i / fps)
+        if resultado is not None and resultado.hand_landmarks:
+            com_maos += 1
+    dt = time.perf_counter() - t0
+    detector.close()
+    return len(frames) / dt, com_maos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("fonte", help="arquivo de vídeo ou índice da câmera")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--modos", nargs="+", default=list(RUNNING_MODES), choices=list(RUNNING_MODES))
+    args = parser.parse_args()
+
+    frames, fps = carregar_frames(args.fonte, args.frames)
+    if not frames:
+        raise SystemExit(f"Nenhum frame lido de {args.fonte}")
+    print(f"{len(frames)} frames de {args.fonte} ({fps:.0f} fps)")
+
+    base = None
+    for modo in args.modos:
+        fps_modo, com_maos = rodar(modo, frames, fps)
+        base = base or fps_modo
+        print(f"{modo:12s} {fps_modo:7.1f} fps  ({fps_modo / base:4.2f}x)  frames com mãos: {com_maos}")
@@ -0,0 +1,236 @@
+"""
+Abertura da câmera com formato negociado.
+
+Por padrão o OpenCV abre a webcam no formato que o driver quiser; em muita
+webcam no Linux isso é YUYV a 5-15 FPS em 640x480. Aqui o formato é pedido
+explicitamente (backend, FOURCC, resolução, FPS), nessa ordem, e depois
+conferido: o que a câmera aceitou de fato vai para o log e para `CaptureInfo`.
+
+Sem câmera (ou com `GIFT_CAMERA` apontando para um arquivo) a fonte vira um
+vídeo tocado em loop no ritmo do próprio FPS, com a mesma interface do
+cv2.VideoCapture, então dá para rodar o jogo e os testes sem webcam.
+
+Configuração por ambiente (ver CaptureConfig.from_env):
+  GIFT_CAMERA=0                 índice, /dev/videoN (ex.: v4l2loopback) ou vídeo
+  GIFT_CAMERA_BACKEND=auto      auto, v4l2, dshow, msmf, avfoundation, any
+  GIFT_CAMERA_SIZE=640x480
+  GIFT_CAMERA_FPS=30
+  GIFT_CAMERA_FOURCC=MJPG       vazio mantém o formato padrão do driver
+  GIFT_CAMERA_FALLBACK=         vídeo usado se nenhuma câmera abrir
+
+  python -m engine.capture            # mostra o que foi negociado e o FPS real
+"""
+import os
+import sys
+import time
+from collections import namedtuple
+
+import cv2
+
+from engine.log import get_logger
+
+log = get_logger("capture")
+
+BACKENDS = {
+    "any": cv2.CAP_ANY,
+    "v4l2": cv2.CAP_V4L2,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+}
+
+# Ordem tentada com backend "auto": o nativo primeiro (no Windows o DSHOW
+# abre bem mais rápido que o MSMF), depois o que o OpenCV escolher
+BACKENDS_AUTO = {
+    "linux": ["v4l2", "any"],
+    "win32": ["dshow", "msmf", "any"],
+    "darwin": ["avfoundation", "any"],
+}
+
+CaptureInfo = namedtuple("CaptureInfo", ["fonte", "backend", "fourcc", "largura", "altura", "fps", "arquivo"])
+
+
+def fourcc_str(codigo):
+    codigo = int(codigo)
+    if codigo <= 0:
+        return ""
+    return "".join(chr((codigo >> (8 * i)) & 0xFF) for i in range(4))
+
+
+class CaptureConfig:
+    """O que pedir para a câmera; o que ela aceitou vem em CaptureInfo"""
+    def __init__(self, fonte=0, backend="auto", largura=640, altura=480, fps=30,
+                 fourcc="MJPG", buffer_size=1, fallback=None):
+        self.fonte = fonte
+        self.backend = backend
+        self.largura = largura
+        self.altura = altura
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.fallback = fallback
+
+    @classmethod
+    def from_env(cls, **padroes):
+        """Config a partir das variáveis GIFT_CAMERA*; `padroes` vale quando a variável não existe"""
+        cfg = cls(**padroes)
+        env = os.environ
+        if "GIFT_CAMERA" in env:
+            fonte = env["GIFT_CAMERA"]
+            cfg.fonte = int(fonte) if fonte.isdigit() else fonte
+        cfg.backend = env.get("GIFT_CAMERA_BACKEND", cfg.backend).lower()
+        if "GIFT_CAMERA_SIZE" in env:
+            largura, altura = env["GIFT_CAMERA_SIZE"].lower().split("x")
+            cfg.largura, cfg.altura = int(largura), int(altura)
+        if "GIFT_CAMERA_FPS" in env:
+            cfg.fps = float(env["GIFT_CAMERA_FPS"]) or None
+        # None/vazio: mantém o formato do driver
+        cfg.fourcc = (env.get("GIFT_CAMERA_FOURCC", cfg.fourcc or "") or "").upper() or None
+        cfg.fallback = env.get("GIFT_CAMERA_FALLBACK", cfg.fallback) or None
+        return cfg
+
+    def backends(self):
+        if self.backend == "auto":
+            return BACKENDS_AUTO.get(sys.platform, ["any"])
+        return [self.backend]
+
+    def is_file(self):
+        """Fonte é um vídeo (não índice nem dispositivo)"""
+        return isinstance(self.fonte, str) and not self.fonte.startswith("/dev/")
+
+
+class FileCapture:
+    """
+    Vídeo em loop com a interface do cv2.VideoCapture que o jogo usa, entregando
+    os frames no ritmo do FPS do arquivo (como uma câmera entregaria).
+    """
+    def __init__(self, path):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._proximo = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        agora = time.monotonic()
+        if self._proximo is None:
+            self._proximo = agora
+        elif agora < self._proximo:
+            time.sleep(self._proximo - agora)
+        # Se atrasou, não tenta recuperar os frames perdidos
+        self._proximo = max(self._proximo, agora) + 1.0 / self.fps
+
+        ok, frame = self.cap.read()
+        if not ok:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
+        return ok, frame
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, valor):
+        return False  # Formato de arquivo não se negocia
+
+    def release(self):
+        self.cap.release()
+
+
+def _open_file(path):
+    cap = FileCapture(path)
+    if not cap.isOpened():
+        cap.release()
+        return None, None
+    info = CaptureInfo(
+        path, "arquivo", fourcc_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        cap.fps, True
+    )
+    return cap, info
+
+
+def _negotiate(cap, config):
+    # FOURCC antes da resolução: no V4L2 trocar o formato depois reseta o tamanho
+    if config.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.largura)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.altura)
+    if config.fps:
+        cap.set(cv2.CAP_PROP_FPS, config.fps)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, config.buffer_size)
+
+
+def _verify(cap, config, backend):
+    """Lê um frame e confere o formato realmente em uso; None se a câmera não entrega"""
+    ok, frame = cap.read()
+    if not ok or frame is None:
+        return None
+    altura, largura = frame.shape[:2]  # o frame manda mais que o get() de alguns drivers
+    info = CaptureInfo(
+        config.fonte, backend, fourcc_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        largura, altura, cap.get(cv2.CAP_PROP_FPS), False
+    )
+    if config.fourcc and info.fourcc and info.fourcc != config.fourcc:
+        log.warning("[CAMERA] Pediu %s, driver ficou com %s", config.fourcc, info.fourcc)
+    if (largura, altura) != (config.largura, config.altura):
+        log.warning("[CAMERA] Pediu %dx%d, veio %dx%d", config.largura, config.altura, largura, altura)
+    if config.fps and info.fps and info.fps < config.fps - 0.5:
+        log.warning("[CAMERA] Pediu %.0f FPS, driver aceitou %.1f", config.fps, info.fps)
+    return info
+
+
+def open_capture(config=None):
+    """
+    Abre a fonte de `config` (padrão: CaptureConfig.from_env()) e devolve
+    (cap, CaptureInfo), ou (None, None) se nem a câmera nem o fallback abriram.
+    """
+    config = config or CaptureConfig.from_env()
+
+    if config.is_file():
+        cap, info = _open_file(config.fonte)
+    else:
+        cap, info = None, None
+        for nome in config.backends():
+            backend = BACKENDS.get(nome)
+            if backend is None:
+                log.warning("[CAMERA] Backend desconhecido: %s", nome)
+                continue
+            t0 = time.perf_counter()
+            cap = cv2.VideoCapture(config.fonte, backend)
+            if not cap.isOpened():
+                cap.release()
+                cap = None
+                continue
+            _negotiate(cap, config)
+            info = _verify(cap, config, nome)
+            if info is not None:
+                log.info("[CAMERA] Aberta em %.0f ms", (time.perf_counter() - t0) * 1000)
+                break
+            cap.release()
+            cap = None
+
+        if cap is None and config.fallback:
+            log.warning("[CAMERA] %s não abriu; usando %s", config.fonte, config.fallback)
+            cap, info = _open_file(config.fallback)
+
+    if cap is None:
+        log.error("[CAMERA] Nenhuma fonte abriu (%s)", config.fonte)
+        return None, None
+    log.info("[CAMERA] %s via %s: %s %dx%d @ %.1f FPS",
+             info.fonte, info.backend, info.fourcc or "?", info.largura, info.altura, info.fps)
+    return cap, info
+
+
+if __name__ == "__main__":
+    cap, info = open_capture()
+    if cap is None:
+        raise SystemExit(1)
+    print(info)
+    n = 90
+    t0 = time.perf_counter()
+    lidos = sum(1 for _ in range(n) if cap.read()[0])
+    tempo = time.perf_counter() - t0
+    cap.release()
+    print(f"FPS real: {lidos / tempo:.1f} ({lidos}/{n} frames em {tempo:.2f}s)")
@@ -1,93 +1,360 @@
+import time
 import numpy as np
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-from ultralytics import YOLO
-import joblib
 import cv2
-from collections import deque, Counter
 
-# -------- modelos --------
-yolo = YOLO("models/yolo26n.pt")
-model_mlp = joblib.load("models/modelo_mlp.pkl")
-scaler = joblib.load("models/scaler.pkl")
+from engine.features import LandmarkFeatures, N_FEATURES
+from engine.log import get_logger
+from engine.models import ModelRegistry, registry
+from engine.profiler import profiler as default_profiler
+from engine.mlp_numpy import load_classifier
+from engine.object_detector import ObjectDetectorService, Deteccoes
+from engine.roi import HandROI, downscale
+from engine.smoothing import GestureSmoother
+from engine.tracking import HandTracker
+from engine.motion import MotionGate
+from engine.game_logic import DETECTOR_MAOS, DETECTOR_OBJETOS
+
+log = get_logger("engine")
+
+# Valores padrão de cada CVEngine (dá para trocar por instância no construtor)
+
+YOLO_PATH = "models/yolo26n.pt"
 
 # -------- mediapipe --------
-BaseOptions = python.BaseOptions
-HandLandmarker = vision.HandLandmarker
-HandLandmarkerOptions = vision.HandLandmarkerOptions
-VisionRunningMode = vision.RunningMode
-
-options = HandLandmarkerOptions(
-    base_options=BaseOptions(model_asset_path="models/hand_landmarker.task"),
-    running_mode=VisionRunningMode.IMAGE,
-    num_hands=2
-)
-
-# -------- buffers suavização --------
-gestos_val = [deque(maxlen=7), deque(maxlen=7)]
-probs_val = [deque(maxlen=7), deque(maxlen=7)]
-
-detector = HandLandmarker.create_from_options(options)
-
-# -------- util --------
-def coords_norm(landmarks):
-    x0, y0, z0 = landmarks[0].x, landmarks[0].y, landmarks[0].z
-    out = []
-    for lm in landmarks:
-        out.extend([lm.x - x0, lm.y - y0, lm.z - z0])
-    return out
-
-
-# -------- função principal --------
-def process_frame(frame, frame_count):
-    print(f"[DEBUG] Frame {frame_count} - Iniciando processamento")
-
-    imageRGB = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=imageRGB)
-    resultados = detector.detect(mp_image)
-
-    pred_hands = ["Nenhum", "Nenhum"]
-    prob_hands = [0.0, 0.0]
-
-    if resultados.hand_landmarks:
-        print(f"[DEBUG] Mãos detectadas: {len(resultados.hand_landmarks)}")
-        for idx, hand_landmarks in enumerate(resultados.hand_landmarks[:2]):
-            coords = coords_norm(hand_landmarks)
-
-            if len(coords) == 63:
-                arr = np.array(coords).reshape(1, -1)
-                arr = scaler.transform(arr)
-
-                pred = model_mlp.predict(arr)[0]
-                prob = np.max(model_mlp.predict_proba(arr)[0])
-
-                gestos_val[idx].append(pred)
-                probs_val[idx].append(prob)
-
-                pred_hands[idx] = Counter(gestos_val[idx]).most_common(1)[0][0]
-                prob_hands[idx] = float(np.mean(probs_val[idx]))
-
-                print(f"[DEBUG] Mão {idx}: {pred_hands[idx]} (prob média: {prob_hands[idx]:.2f})")
-    else:
-        print("[DEBUG] Nenhuma mão detectada")
-
-    objetos = []
-    if frame_count % 10 == 0:
-        resultados_yolo = yolo(frame, verbose=False)
-        for box in resultados_yolo[0].boxes:
-            cls = int(box.cls[0])
-            label = yolo.names[cls]
-            conf = float(box.conf[0])
-            if conf > 0.6:
-                objetos.append(label)
-                print(f"[DEBUG] Objeto detectado: {label} (conf: {conf:.2f})")
-
-    print("[DEBUG] Processamento concluído")
-    return {
-        "gesto0": pred_hands[0],
-        "gesto1": pred_hands[1],
-        "prob0": prob_hands[0],
-        "prob1": prob_hands[1],
-        "objetos": objetos
-    }
+# "video" rastreia as mãos entre frames usando o timestamp da captura;
+# "image" é o modo antigo (detecção completa em todo frame). Ver engine/hand_landmarker.py
+HAND_RUNNING_MODE = "video"
+
+# -------- resolução de inferência --------
+# MediaPipe: maior lado da imagem enviada (None = resolução da câmera).
+# HAND_ROI recorta em volta das mãos do frame anterior e olha o frame todo
+# a cada HAND_ROI_REACQUIRE frames (ver engine/roi.py). Só vale no modo
+# "image": "video" e "live_stream" rastreiam a mão nas coordenadas do frame
+# anterior, que deixam de valer quando o recorte muda
+HAND_MAX_SIDE = None
+HAND_ROI = True
+HAND_ROI_REACQUIRE = 15
+# YOLO: lado da entrada da rede (None = o do modelo, 640)
+YOLO_IMGSZ = None
+
+# -------- suavização (ver engine/smoothing.py) --------
+# "voto" (maioria na janela), "ema" ou "histerese"
+SMOOTHING = "voto"
+# Parâmetros padrão por estratégia (o que faltar fica no padrão da classe)
+SMOOTHING_PARAMS = {"voto": {"janela": 7}}
+# Estado de suavização por mão rastreada, não pela ordem de saída do MediaPipe
+TRACK_TIMEOUT_S = 0.5
+
+# -------- cena parada --------
+# Sem movimento na miniatura, reaproveita o último resultado (ver engine/motion.py).
+# O YOLO só recebe frame novo a cada refresh: o refresh precisa vir bem antes de
+# a detecção passar de YOLO_MAX_AGE (contando o tempo do próprio YOLO), senão um
+# objeto parado some entre um refresh e outro
+MOTION_GATE = True
+MOTION_REFRESH_S = 0.5
+
+# -------- yolo em background --------
+YOLO_CONF_MIN = 0.6
+YOLO_MAX_AGE = 1.0  # segundos: detecções mais velhas que isso são ignoradas
+
+_FRAME_WARMUP = np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+class CVEngine:
+    """
+    MediaPipe + classificador + YOLO e todo o estado entre frames (ROI,
+    tracks, suavização, cena parada) de um fluxo de vídeo.
+
+    Cada instância tem seus modelos (num ModelRegistry próprio, carregados
+    sob demanda) e seus buffers, então dá para ter várias no mesmo processo
+    ou uma por worker de um process pool. Use `close()` (ou `with`) ao final.
+
+    `yolo_sincrono=True` roda o YOLO dentro do `process()` em todo frame,
+    para replay/avaliação offline reproduzíveis (no jogo ele fica na sua
+    thread). Os `ts` passados ao `process()` são o relógio de tudo, inclusive
+    da idade das detecções. Tempos e contadores vão para `profiler` (padrão: o
+    compartilhado do jogo); dê um Profiler próprio para medir a instância isolada.
+    """
+    def __init__(self, running_mode=HAND_RUNNING_MODE, hand_max_side=HAND_MAX_SIDE,
+                 hand_roi=HAND_ROI, hand_roi_reacquire=HAND_ROI_REACQUIRE,
+                 smoothing=SMOOTHING, smoothing_params=None, track_timeout_s=TRACK_TIMEOUT_S,
+                 motion_gate=MOTION_GATE, motion_refresh_s=MOTION_REFRESH_S,
+                 yolo_path=YOLO_PATH, yolo_imgsz=YOLO_IMGSZ, yolo_conf_min=YOLO_CONF_MIN,
+                 yolo_max_age=YOLO_MAX_AGE, yolo_sincrono=False, models=None, profiler=None):
+        self.running_mode = running_mode
+        self.hand_max_side = hand_max_side
+        self.usar_roi = hand_roi
+        self.smoothing = smoothing
+        if smoothing_params is None:
+            smoothing_params = SMOOTHING_PARAMS.get(smoothing, {})
+        self.smoothing_params = dict(smoothing_params)
+        self.usar_motion_gate = motion_gate
+        self.yolo_path = yolo_path
+        self.yolo_imgsz = yolo_imgsz
+        self.yolo_conf_min = yolo_conf_min
+        self.yolo_max_age = yolo_max_age
+        self.yolo_sincrono = yolo_sincrono
+        self.profiler = profiler or default_profiler
+
+        self.features = LandmarkFeatures(max_hands=2)
+        self.hand_roi = HandROI(reacquire_every=hand_roi_reacquire,
+                                ativo=self._roi_ativo(running_mode))
+        self.hand_tracker = HandTracker(timeout_s=track_timeout_s)
+        # Ver MOTION_REFRESH_S: refresh nunca mais lento que metade da idade máxima do YOLO
+        self.motion_gate = MotionGate(refresh_s=min(motion_refresh_s, yolo_max_age / 2))
+        self._suavizador = None  # criado no primeiro uso: precisa das classes do classificador
+        self._rgb = None         # buffer RGB reaproveitado entre frames (o mp.Image copia os dados)
+        self._ultimo = None      # (detectores, dados) do último frame que rodou inferência
+        self._indisponiveis = set()  # modelos que falharam ao carregar (já avisados no log)
+        self._recriar_maos = False   # troca do detector pendente (feita no próximo process)
+        self.frames = 0
+
+        self.models = models if models is not None else ModelRegistry()
+        self.models.register("maos", self._carregar_maos, self._aquecer_maos)
+        # scaler + MLP fundidos num forward pass NumPy (ver engine/mlp_numpy.py)
+        self.models.register("classificador", load_classifier, self._aquecer_classificador)
+        self.models.register("yolo", self._carregar_yolo, self._aquecer_yolo)
+        self.models.register("objetos", self._carregar_objetos)
+
+    # -------- modelos --------
+    def _carregar_maos(self):
+        # Import aqui: o mediapipe sozinho já leva um tempo para importar
+        from engine.hand_landmarker import HandDetector
+        return HandDetector(self.running_mode, num_hands=2)
+
+    def _aquecer_maos(self, detector):
+        detector.detect(cv2.cvtColor(_FRAME_WARMUP, cv2.COLOR_BGR2RGB), 0.0)
+
+    def _aquecer_classificador(self, classificador):
+        classificador.predict(np.zeros((1, N_FEATURES), dtype=np.float32))
+
+    def _carregar_yolo(self):
+        from ultralytics import YOLO  # importa o torch: segundos
+        return YOLO(self.yolo_path)
+
+    def _aquecer_yolo(self, yolo):
+        kwargs = {"imgsz": self.yolo_imgsz} if self.yolo_imgsz else {}
+        yolo(_FRAME_WARMUP, verbose=False, **kwargs)
+
+    def _carregar_objetos(self):
+        service = ObjectDetectorService(
+            self.models.get("yolo"), conf_min=self.yolo_conf_min,
+            max_age=self.yolo_max_age, imgsz=self.yolo_imgsz, sincrono=self.yolo_sincrono,
+            profiler=self.profiler
+        )
+        if not self.yolo_sincrono:
+            service.start()
+        return service
+
+    def _modelo(self, nome):
+        """
+        Modelo carregado, ou None se a carga falhou: o detector correspondente
+        passa a não detectar nada em vez de derrubar o `process()` a cada frame.
+        """
+        try:
+            return self.models.get(nome)
+        except Exception:
+            if nome not in self._indisponiveis:
+                self._indisponiveis.add(nome)
+                log.error("Modelo %s indisponível: seguindo sem ele", nome)
+            return None
+
+    # -------- configuração --------
+    def reset(self):
+        """Esquece todo o estado entre frames (ex.: antes de outro vídeo/sessão)"""
+        # O HandLandmarker guarda o rastreamento e o último timestamp (o próximo
+        # vídeo recomeça do 0): só um detector novo começa do zero. A troca fica
+        # para o próximo process(), na thread que usa o detector, para nunca
+        # fechar um detector no meio de um detect() (reset pode vir da GUI)
+        self._recriar_maos = True
+        self._reset_maos()
+        self.motion_gate.reset()
+        self._ultimo = None
+        objetos_service = self.models.peek("objetos")
+        if objetos_service is not None:
+            objetos_service.reset()
+
+    def _reset_maos(self):
+        """Votos, tracks e ROI das mãos"""
+        if self._suavizador is not None:
+            self._suavizador.reset()
+        self.hand_tracker.reset()
+        self.hand_roi.reset()
+
+    def set_smoothing(self, estrategia, **params):
+        """Troca a estratégia de suavização (ex.: set_smoothing("ema", alpha=0.3))"""
+        self.smoothing, self.smoothing_params = estrategia, params
+        self._suavizador = None
+
+    def _get_suavizador(self):
+        if self._suavizador is None:
+            classes = self.models.get("classificador").classes
+            self._suavizador = GestureSmoother(classes, self.smoothing, **self.smoothing_params)
+        return self._suavizador
+
+    def _trocar_detector_maos(self):
+        """Recria o detector de mãos (se já carregou) pela carga + warm-up do registry"""
+        self._recriar_maos = False
+        antigo = self.models.peek("maos")
+        if antigo is None:
+            return  # Ainda não carregou: a carga normal já usa o modo atual
+        try:
+            self.models.reload("maos")
+        except Exception:
+            log.exception("Falha ao recriar o detector de mãos")
+        self._indisponiveis.discard("maos")
+        antigo.close()
+
+    def _roi_ativo(self, modo):
+        # "video" rastreia a mão na região do frame anterior e "live_stream" devolve
+        # resultados de frames anteriores (outro recorte): só "image" aceita o recorte
+        return self.usar_roi and modo == "image"
+
+    def set_running_mode(self, modo):
+        """Troca o modo do HandLandmarker ("image", "video" ou "live_stream")"""
+        self.running_mode = modo
+        self.hand_roi.ativo = self._roi_ativo(modo)
+        self.reset()  # O detector é recriado no modo novo no próximo process()
+
+    # -------- frame --------
+    def process(self, frame, ts=None, detectores=None):
+        """
+        `detectores`: conjunto com os detectores a rodar (ver
+        GameState.detectores_necessarios); None roda todos.
+        """
+        frame_count = self.frames
+        self.frames += 1
+        log.debug("Frame %d - iniciando processamento", frame_count)
+
+        if self._recriar_maos:
+            self._trocar_detector_maos()
+
+        if detectores is None:
+            detectores = (DETECTOR_MAOS, DETECTOR_OBJETOS)
+        detectores = frozenset(detectores)
+        if ts is None:
+            ts = time.monotonic()
+
+        if detectores and self.usar_motion_gate:
+            # Troca de fase (outros detectores) sempre roda de verdade
+            reaproveita = self._ultimo is not None and self._ultimo[0] == detectores
+            with self.profiler.stage("motion"):
+                mudou = self.motion_gate.changed(frame, ts, forcar=not reaproveita)
+            if not mudou:
+                self.profiler.count("inferencias_puladas")
+                log.debug("Frame %d - cena parada, reaproveitando resultado", frame_count)
+                dados = dict(self._ultimo[1])
+                # O YOLO (em background) pode ter terminado depois do último frame
+                # processado: ler o resultado é barato e não roda inferência
+                objetos_service = self.models.peek("objetos") if DETECTOR_OBJETOS in detectores else None
+                if objetos_service is not None:
+                    deteccoes = objetos_service.latest(agora=ts)
+                    dados["objetos"], dados["objetos_ts"] = deteccoes.objetos, deteccoes.ts
+                return dados
+            self.profiler.count("inferencias_executadas")
+
+        pred_hands = ["Nenhum", "Nenhum"]
+        prob_hands = [0.0, 0.0]
+        tracks = []
+
+        resultados = None
+        detector = self._modelo("maos") if DETECTOR_MAOS in detectores else None
+        if detector is not None:
+            with self.profiler.stage("recorte"):
+                recorte, regiao = self.hand_roi.crop(frame)
+                recorte = downscale(recorte, self.hand_max_side)
+            with self.profiler.stage("bgr2rgb"):
+                self._rgb = cv2.cvtColor(recorte, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            with self.profiler.stage("mediapipe"):
+                resultados = detector.detect(self._rgb, ts)
+            # Landmarks do recorte → coordenadas do frame inteiro
+            inteiro = self.hand_roi.update(resultados.hand_landmarks if resultados else None, regiao, frame.shape)
+            self.profiler.count("maos_frame_inteiro" if inteiro else "maos_roi")
+        else:
+            # Fase sem gestos (ou sem MediaPipe): não deixa votos velhos para a próxima
+            self._reset_maos()
+
+        classificador = self._modelo("classificador") if resultados is not None else None
+        if resultados is not None and resultados.hand_landmarks and classificador is not None:
+            maos = resultados.hand_landmarks[:2]
+            log.debug("Mãos detectadas: %d", len(maos))
+
+            # Uma chamada do classificador para todas as mãos: (n_maos, 63) → (n_maos, n_classes)
+            with self.profiler.stage("mlp"):
+                proba = classificador.predict_proba(self.features.extrair(maos))
+
+            suavizador = self._get_suavizador()
+            tracks, expiradas = self.hand_tracker.update(maos, resultados.handedness, ts)
+            for tid in expiradas:
+                suavizador.remove(tid)
+            for idx, tid in enumerate(tracks):
+                pred_hands[idx], prob_hands[idx] = suavizador.update(tid, proba[idx])
+                log.debug("Mão %d (track %d): %s (prob média: %.2f)", idx, tid, pred_hands[idx], prob_hands[idx])
+        elif resultados is not None:
+            log.debug("Nenhuma mão detectada")
+            # Sem mãos no frame: só expira as tracks antigas
+            _, expiradas = self.hand_tracker.update([], None, ts)
+            if self._suavizador is not None:
+                for tid in expiradas:
+                    self._suavizador.remove(tid)
+
+        # YOLO roda na sua própria thread (ou aqui mesmo, se síncrono); entrega o frame e lê o último resultado
+        objetos_service = self._modelo("objetos") if DETECTOR_OBJETOS in detectores else None
+        if objetos_service is not None:
+            objetos_service.submit(frame, ts)
+            deteccoes = objetos_service.latest(agora=ts)
+        else:
+            deteccoes = Deteccoes([], 0.0)
+
+        log.debug("Processamento concluído")
+        dados = {
+            "gesto0": pred_hands[0],
+            "gesto1": pred_hands[1],
+            "prob0": prob_hands[0],
+            "prob1": prob_hands[1],
+            "tracks": tracks,
+            "objetos": deteccoes.objetos,
+            "objetos_ts": deteccoes.ts
+        }
+        self._ultimo = (detectores, dados)
+        return dict(dados)
+
+    def close(self):
+        """Encerra a thread do YOLO e libera o MediaPipe (só o que chegou a carregar)"""
+        objetos_service = self.models.peek("objetos")
+        if objetos_service is not None:
+            objetos_service.stop()
+        detector = self.models.peek("maos")
+        if detector is not None:
+            detector.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -------- engine do jogo (compatibilidade com a API de módulo) --------
+# Usa o registry compartilhado, que o app_qt carrega em background
+engine = CVEngine(models=registry)
+
+
+def process_frame(frame, frame_count, ts=None, detectores=None):
+    return engine.process(frame, ts, detectores)
+
+
+def reset_buffers():
+    engine.reset()
+
+
+def set_smoothing(estrategia, **params):
+    engine.set_smoothing(estrategia, **params)
+
+
+def set_running_mode(modo):
+    engine.set_running_mode(modo)
+
+
+def shutdown():
+    engine.close()
@@ -0,0 +1,188 @@
+"""
+Dataset de landmarks em formato binário, para coleta e treino.
+
+Um diretório (ex.: data/landmarks/) com:
+  X.f32       linhas float32 de N_FEATURES (features de engine/features.py), cruas
+  y.i16       código do rótulo de cada linha (int16)
+  index.json  classes, número de linhas e sessões de coleta
+
+A coleta só acrescenta no fim dos arquivos (em blocos) e atualiza o
+index.json por último, com troca atômica. Se o processo morrer no meio,
+o que passou do `linhas` do índice é descartado na próxima abertura.
+
+A leitura é um np.memmap: nada de parse de texto, e datasets de várias
+sessões não precisam caber na RAM.
+
+  python -m engine.dataset info data/landmarks
+  python -m engine.dataset convert data/coords_to_train.csv data/landmarks
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from engine.features import N_FEATURES
+
+DATASET_PATH = "data/landmarks"
+VERSAO = 1
+
+
+def _paths(path):
+    return (os.path.join(path, "X.f32"), os.path.join(path, "y.i16"), os.path.join(path, "index.json"))
+
+
+def _ler_indice(path):
+    with open(_paths(path)[2]) as f:
+        indice = json.load(f)
+    if indice.get("n_features") != N_FEATURES:
+        raise ValueError(f"{path}: {indice.get('n_features')} features, o engine usa {N_FEATURES}")
+    return indice
+
+
+def _salvar_indice(path, indice):
+    destino = _paths(path)[2]
+    tmp = destino + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(indice, f, indent=1)
+    os.replace(tmp, destino)
+
+
+class Dataset:
+    """Leitura: `X` (memmap float32 (n, N_FEATURES)), `y` (códigos) e `labels` (rótulos)"""
+    def __init__(self, path=DATASET_PATH):
+        self.path = path
+        indice = _ler_indice(path)
+        self.classes = np.array(indice["classes"])
+        self.sessoes = indice["sessoes"]
+        n = indice["linhas"]
+        x_path, y_path, _ = _paths(path)
+        if n:
+            self.X = np.memmap(x_path, dtype=np.float32, mode="r", shape=(n, N_FEATURES))
+            self.y = np.memmap(y_path, dtype=np.int16, mode="r", shape=(n,))
+        else:
+            self.X = np.zeros((0, N_FEATURES), dtype=np.float32)
+            self.y = np.zeros(0, dtype=np.int16)
+
+    def __len__(self):
+        return len(self.y)
+
+    @property
+    def labels(self):
+        return self.classes[self.y]
+
+    def contagem(self):
+        """{rótulo: linhas}"""
+        return dict(zip(self.classes.tolist(), np.bincount(self.y, minlength=len(self.classes)).tolist()))
+
+    def __repr__(self):
+        return f"Dataset({self.path!r}, linhas={len(self)}, sessões={len(self.sessoes)}, {self.contagem()})"
+
+
+def load_dataset(path=DATASET_PATH):
+    return Dataset(path)
+
+
+class DatasetWriter:
+    """
+    Acrescenta linhas (features + rótulo) ao dataset em `path`, criando se
+    não existir. Cada writer é uma sessão no índice. As linhas ficam num
+    bloco pré-alocado e vão para o disco em `flush()` (automático quando o
+    bloco enche, e no `close()`).
+    """
+    def __init__(self, path=DATASET_PATH, fonte=None, bloco=256):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        x_path, y_path, indice_path = _paths(path)
+        if os.path.exists(indice_path):
+            self.indice = _ler_indice(path)
+        else:
+            self.indice = {"versao": VERSAO, "n_features": N_FEATURES, "dtype": "float32",
+                           "classes": [], "linhas": 0, "sessoes": []}
+
+        # Descarta o que foi escrito depois do último índice salvo (processo morto no meio)
+        n = self.indice["linhas"]
+        self._x = open(x_path, "ab")
+        self._y = open(y_path, "ab")
+        self._x.truncate(n * N_FEATURES * 4)
+        self._y.truncate(n * 2)
+
+        self._codigos = {c: i for i, c in enumerate(self.indice["classes"])}
+        self._bloco_x = np.empty((bloco, N_FEATURES), dtype=np.float32)
+        self._bloco_y = np.empty(bloco, dtype=np.int16)
+        self._pendentes = 0
+        self.sessao = {"inicio": n, "fim": n, "fonte": fonte,
+                       "criada_em": time.strftime("%Y-%m-%d %H:%M:%S")}
+        self.indice["sessoes"].append(self.sessao)
+
+    def append(self, features, label):
+        """`features`: (N_FEATURES,) ou (1, N_FEATURES), ex.: LandmarkFeatures.extrair(...)"""
+        codigo = self._codigos.get(label)
+        if codigo is None:
+            codigo = self._codigos[label] = len(self.indice["classes"])
+            self.indice["classes"].append(label)
+        self._bloco_x[self._pendentes] = np.reshape(features, N_FEATURES)
+        self._bloco_y[self._pendentes] = codigo
+        self._pendentes += 1
+        if self._pendentes == len(self._bloco_y):
+            self.flush()
+
+    def flush(self):
+        if self._pendentes:
+            self._x.write(self._bloco_x[:self._pendentes].tobytes())
+            self._y.write(self._bloco_y[:self._pendentes].tobytes())
+            self.indice["linhas"] += self._pendentes
+            self._pendentes = 0
+        self._x.flush()
+        self._y.flush()
+        os.fsync(self._x.fileno())
+        os.fsync(self._y.fileno())
+        # Índice por último: só conta linhas que já estão no disco
+        self.sessao["fim"] = self.indice["linhas"]
+        _salvar_indice(self.path, self.indice)
+
+    def close(self):
+        if self.sessao["inicio"] == self.indice["linhas"] + self._pendentes:
+            self.indice["sessoes"].remove(self.sessao)  # Sessão sem nenhuma linha
+        self.flush()
+        self._x.close()
+        self._y.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_csv(csv_path, path=DATASET_PATH):
+    """CSV antigo do get-data-opencv.py (63 colunas + rótulo) → dataset binário"""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    X = df.iloc[:, :N_FEATURES].values.astype(np.float32)
+    y = df.iloc[:, N_FEATURES].astype(str).values
+    with DatasetWriter(path, fonte=csv_path) as writer:
+        for linha, label in zip(X, y):
+            writer.append(linha, label)
+    return load_dataset(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_info = sub.add_parser("info", help="resumo do dataset")
+    p_info.add_argument("path", nargs="?", default=DATASET_PATH)
+    p_conv = sub.add_parser("convert", help="importa um CSV do formato antigo")
+    p_conv.add_argument("csv")
+    p_conv.add_argument("path", nargs="?", default=DATASET_PATH)
+    args = parser.parse_args()
+
+    if args.cmd == "convert":
+        ds = convert_csv(args.csv, args.path)
+    else:
+        ds = load_dataset(args.path)
+    print(ds)
+    for s in ds.sessoes:
+        print(f"   {s['criada_em']}  linhas {s['inicio']}-{s['fim']}  {s['fonte'] or ''}")
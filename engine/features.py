@@ -0,0 +1,42 @@
+import numpy as np
+
+
+# -------- formato das features --------
+N_LANDMARKS = 21
+N_COORDS = 3
+N_FEATURES = N_LANDMARKS * N_COORDS  # 63: (x, y, z) de cada ponto relativo ao pulso
+WRIST = 0
+
+
+def wrist_relative(pontos, out=None):
+    """(n, 21, 3) em coordenadas da imagem → (n, 63) relativas ao pulso"""
+    out = np.subtract(pontos, pontos[:, WRIST:WRIST + 1, :], out=out)
+    return out.reshape(len(pontos), N_FEATURES)
+
+
+class LandmarkFeatures:
+    """
+    Converte as mãos do MediaPipe em features usando buffers pré-alocados
+    float32. É o mesmo código no jogo (engine/cv_engine.py), na coleta
+    (get-data-opencv.py) e no treino (modeling-mlp.ipynb), então as features
+    são idênticas nos três.
+
+    Os arrays devolvidos são views dos buffers internos: valem até a próxima
+    chamada (copie se precisar guardar).
+    """
+    def __init__(self, max_hands=2):
+        self.max_hands = max_hands
+        self.pontos = np.zeros((max_hands, N_LANDMARKS, N_COORDS), dtype=np.float32)
+        self._relativos = np.zeros_like(self.pontos)
+
+    def preencher(self, hand_landmarks):
+        """Lista de mãos do MediaPipe → view (n, 21, 3) com x, y, z da imagem"""
+        n = min(len(hand_landmarks), self.max_hands)
+        for i in range(n):
+            self.pontos[i] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks[i]]
+        return self.pontos[:n]
+
+    def extrair(self, hand_landmarks):
+        """Lista de mãos do MediaPipe → view (n, 63) relativa ao pulso"""
+        pontos = self.preencher(hand_landmarks)
+        return wrist_relative(pontos, out=self._relativos[:len(pontos)])
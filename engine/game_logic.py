@@ -1,5 +1,20 @@
 import time
 
+from engine.log import get_logger
+
+log = get_logger("game")
+
+# -------- detectores por tipo de fase --------
+DETECTOR_MAOS = "maos"
+DETECTOR_OBJETOS = "objetos"
+
+DETECTORES_POR_TIPO = {
+    "gesto_unico": frozenset({DETECTOR_MAOS}),
+    "gesto_duplo": frozenset({DETECTOR_MAOS}),
+    "objeto": frozenset({DETECTOR_OBJETOS}),
+    "video": frozenset(),
+}
+
 class GameState:
     def __init__(self, fases):
         self.fases = fases
@@ -10,28 +25,36 @@ class GameState:
 
     def start_game(self):
         """Chamado quando usuário aperta ESPAÇO no menu"""
-        print("[GAME] Jogo iniciado - aguardando intro...")
+        log.info("[GAME] Jogo iniciado - aguardando intro...")
         self.menu_active = False
         self.waiting_for_intro_complete = True
         # Fase ainda é -1 (menu), UI vai mostrar textos de intro
 
     def intro_completed(self):
         """Chamado quando textos de intro terminam"""
-        print("[GAME] Intro completa - iniciando prólogo (fase 0)")
+        log.info("[GAME] Intro completa - iniciando prólogo (fase 0)")
         self.waiting_for_intro_complete = False
         self.fase_atual = 0  # Prólogo
         self.cooldown_time = time.time() + 0.5
 
     def video_finished(self):
         """Chamado quando vídeo (prólogo ou fase) termina"""
-        print(f"[GAME] Vídeo terminou na fase {self.fase_atual}")
+        log.info("[GAME] Vídeo terminou na fase %s", self.fase_atual)
         if self.fase_atual >= 0 and self.fase_atual < len(self.fases):
             fase = self.fases[self.fase_atual]
             if fase["tipo"] == "video":
                 # Avança para próxima fase
                 self.fase_atual += 1
                 self.cooldown_time = time.time() + 0.5
-                print(f"[GAME] → Avançando para fase {self.fase_atual}")
+                log.info("[GAME] → Avançando para fase %s", self.fase_atual)
+
+    def detectores_necessarios(self):
+        """Detectores que a fase atual usa (menu, intro, vídeos e fim: nenhum)"""
+        if self.menu_active or self.waiting_for_intro_complete:
+            return frozenset()
+        if self.fase_atual < 0 or self.fase_atual >= len(self.fases):
+            return frozenset()
+        return DETECTORES_POR_TIPO.get(self.fases[self.fase_atual]["tipo"], frozenset())
 
     def update(self, g0, g1, objetos=None):
         """Verifica condições de vitória em fases de gameplay"""
@@ -53,28 +76,28 @@ class GameState:
 
         # Debug: mostra o que está sendo verificado
         if g0 != "Nenhum" or g1 != "Nenhum" or (objetos and len(objetos) > 0):
-            print(f"[GAME DEBUG] Fase {self.fase_atual} ({tipo}): g0={g0}, g1={g1}, obj={objetos}")
+            log.debug("Fase %d (%s): g0=%s, g1=%s, obj=%s", self.fase_atual, tipo, g0, g1, objetos)
 
         # Gestos/objetos
         if tipo == "gesto_unico":
             if g0 == fase["gesto"] or g1 == fase["gesto"]:
-                print(f"[GAME] ✓ Gesto {fase['gesto']} detectado!")
+                log.info("[GAME] ✓ Gesto %s detectado!", fase['gesto'])
                 self.fase_atual += 1
                 self.cooldown_time = time.time() + 1.0
                 return "fase_ok"
 
         if tipo == "gesto_duplo":
             a, b = fase["gestos"]
-            print(f"[GAME DEBUG] Verificando gesto_duplo: precisa {a}+{b}, tem g0={g0}, g1={g1}")
+            log.debug("Verificando gesto_duplo: precisa %s+%s, tem g0=%s, g1=%s", a, b, g0, g1)
             if (g0 == a and g1 == b) or (g0 == b and g1 == a):
-                print(f"[GAME] ✓ Gesto duplo {a}+{b} detectado!")
+                log.info("[GAME] ✓ Gesto duplo %s+%s detectado!", a, b)
                 self.fase_atual += 1
                 self.cooldown_time = time.time() + 1.0
                 return "fase_ok"
 
         if tipo == "objeto":
             if objetos and fase["objeto"] in objetos:
-                print(f"[GAME] ✓ Objeto {fase['objeto']} detectado!")
+                log.info("[GAME] ✓ Objeto %s detectado!", fase['objeto'])
                 self.fase_atual += 1
                 self.cooldown_time = time.time() + 1.0
                 return "fase_ok"
@@ -0,0 +1,78 @@
+import threading
+
+import mediapipe as mp
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+
+
+BaseOptions = python.BaseOptions
+HandLandmarker = vision.HandLandmarker
+HandLandmarkerOptions = vision.HandLandmarkerOptions
+VisionRunningMode = vision.RunningMode
+
+MODEL_PATH = "models/hand_landmarker.task"
+
+# "image":       detecção completa de palma em todo frame (sem memória entre frames)
+# "video":       síncrono, reaproveita a ROI das mãos rastreadas no frame anterior
+# "live_stream": assíncrono com callback; devolve o último resultado pronto
+RUNNING_MODES = {
+    "image": VisionRunningMode.IMAGE,
+    "video": VisionRunningMode.VIDEO,
+    "live_stream": VisionRunningMode.LIVE_STREAM,
+}
+
+
+class HandDetector:
+    """HandLandmarker do MediaPipe com o modo de execução escolhido"""
+    def __init__(self, modo="video", num_hands=2, model_path=MODEL_PATH):
+        if modo not in RUNNING_MODES:
+            raise ValueError(f"Modo inválido: {modo} (use {', '.join(RUNNING_MODES)})")
+        self.modo = modo
+        self._ultimo_ts_ms = -1
+        self._live_resultado = None
+        self._live_lock = threading.Lock()
+
+        kwargs = {}
+        if modo == "live_stream":
+            kwargs["result_callback"] = self._on_live_result
+
+        options = HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=RUNNING_MODES[modo],
+            num_hands=num_hands,
+            **kwargs
+        )
+        self.landmarker = HandLandmarker.create_from_options(options)
+
+    def detect(self, imageRGB, ts):
+        """
+        `ts` em segundos (timestamp da captura). Em "live_stream" o retorno é
+        o resultado mais recente já pronto (pode ser de um frame anterior, ou
+        None no começo).
+        """
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=imageRGB)
+        if self.modo == "image":
+            return self.landmarker.detect(mp_image)
+
+        ts_ms = self._next_ts_ms(ts)
+        if self.modo == "video":
+            return self.landmarker.detect_for_video(mp_image, ts_ms)
+
+        self.landmarker.detect_async(mp_image, ts_ms)
+        with self._live_lock:
+            return self._live_resultado
+
+    def close(self):
+        self.landmarker.close()
+
+    def _next_ts_ms(self, ts):
+        # MediaPipe exige timestamps estritamente crescentes
+        ts_ms = int(ts * 1000)
+        if ts_ms <= self._ultimo_ts_ms:
+            ts_ms = self._ultimo_ts_ms + 1
+        self._ultimo_ts_ms = ts_ms
+        return ts_ms
+
+    def _on_live_result(self, resultado, imagem, ts_ms):
+        with self._live_lock:
+            self._live_resultado = resultado
@@ -0,0 +1,99 @@
+"""
+Logging do jogo (engine, lógica e UI).
+
+- Nível por variável de ambiente: GIFT_LOG_LEVEL=DEBUG python app_qt.py
+- Limite por mensagem: cada ponto do código que loga em DEBUG passa no
+  máximo uma vez a cada GIFT_LOG_RATE segundos (padrão 1.0; 0 desliga).
+  INFO e acima (eventos do jogo) nunca são suprimidos.
+  As repetições suprimidas são contadas e aparecem na próxima que passar.
+- Assíncrono: quem loga só coloca o registro numa fila; a escrita no
+  terminal acontece numa thread separada (QueueListener).
+
+No caminho quente use formatação preguiçosa (`log.debug("x=%s", x)`), assim
+nada é formatado quando o nível está desligado.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+
+ROOT = "gift"
+LEVEL_ENV = "GIFT_LOG_LEVEL"
+RATE_ENV = "GIFT_LOG_RATE"
+FORMAT = "%(asctime)s.%(msecs)03d %(levelname)-7s %(name)s: %(message)s"
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """Deixa passar no máximo um registro por `intervalo` segundos por ponto de log"""
+    def __init__(self, intervalo=1.0, nivel_max=logging.DEBUG):
+        super().__init__()
+        self.intervalo = intervalo
+        self.nivel_max = nivel_max
+        self._ultimo = {}
+        self._suprimidos = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.intervalo <= 0 or record.levelno > self.nivel_max:
+            return True
+
+        chave = (record.pathname, record.lineno)
+        agora = time.monotonic()
+        with self._lock:
+            if agora - self._ultimo.get(chave, -self.intervalo) < self.intervalo:
+                self._suprimidos[chave] = self._suprimidos.get(chave, 0) + 1
+                return False
+            self._ultimo[chave] = agora
+            suprimidos = self._suprimidos.pop(chave, 0)
+
+        if suprimidos:
+            record.msg = f"{record.msg} (+{suprimidos} suprimidas)"
+        return True
+
+
+def setup(level=None, rate=None):
+    """Configura o logger raiz do jogo (idempotente)"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        level = level or os.environ.get(LEVEL_ENV, "INFO")
+        rate = float(os.environ.get(RATE_ENV, 1.0)) if rate is None else rate
+
+        saida = logging.StreamHandler()
+        saida.setFormatter(logging.Formatter(FORMAT, datefmt="%H:%M:%S"))
+
+        fila = queue.SimpleQueue()
+        handler = logging.handlers.QueueHandler(fila)
+        # Filtra antes de enfileirar: mensagem suprimida não custa nada além do lookup
+        handler.addFilter(RateLimitFilter(rate))
+
+        root = logging.getLogger(ROOT)
+        root.setLevel(level.upper() if isinstance(level, str) else level)
+        root.addHandler(handler)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(fila, saida)
+        _listener.start()
+        atexit.register(shutdown)
+
+
+def shutdown():
+    """Esvazia a fila e para a thread de escrita"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(nome):
+    setup()
+    return logging.getLogger(f"{ROOT}.{nome}")
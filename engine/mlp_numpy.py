@@ -0,0 +1,213 @@
+"""
+Classificador de gestos em NumPy puro.
+
+Exporta os pesos do `StandardScaler` + `MLPClassifier` (models/*.pkl) para um
+.npz com o scaler já embutido na primeira camada, e faz o forward pass
+vetorizado: um único produto de matrizes por camada devolve rótulo e
+probabilidade de todas as mãos de uma vez.
+
+    python -m engine.mlp_numpy            # exporta models/modelo_mlp_fused.npz
+    python -m engine.mlp_numpy --check    # exporta e compara com o sklearn
+"""
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from engine.log import get_logger
+
+
+log = get_logger("engine.mlp")
+
+MLP_PATH = "models/modelo_mlp.pkl"
+SCALER_PATH = "models/scaler.pkl"
+FUSED_PATH = "models/modelo_mlp_fused.npz"
+
+ACTIVATIONS = {
+    "identity": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0, out=x),
+    "tanh": lambda x: np.tanh(x, out=x),
+    "logistic": lambda x: 1.0 / (1.0 + np.exp(-x)),
+}
+
+
+def _sha1_arquivos(*paths):
+    h = hashlib.sha1()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class FusedMLP:
+    """MLP do sklearn com o StandardScaler embutido na 1ª camada"""
+    def __init__(self, weights, biases, classes, activation="relu", out_activation="softmax", fonte_sha1=""):
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.classes = np.asarray(classes)
+        self.activation = activation
+        self.out_activation = out_activation
+        self.fonte_sha1 = fonte_sha1
+        self._act = ACTIVATIONS[activation]
+
+    @property
+    def n_features(self):
+        return self.weights[0].shape[0]
+
+    # -------- construção --------
+    @classmethod
+    def from_sklearn(cls, scaler, mlp, fonte_sha1=""):
+        """
+        (x - mean) / scale @ W1 + b1  ==  x @ (W1 / scale[:, None]) + (b1 - (mean / scale) @ W1)
+        """
+        n = mlp.coefs_[0].shape[0]
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n)
+
+        w1 = mlp.coefs_[0] / scale[:, None]
+        b1 = mlp.intercepts_[0] - (mean / scale) @ mlp.coefs_[0]
+
+        return cls(
+            [w1] + list(mlp.coefs_[1:]),
+            [b1] + list(mlp.intercepts_[1:]),
+            mlp.classes_,
+            activation=mlp.activation,
+            out_activation=mlp.out_activation_,
+            fonte_sha1=fonte_sha1,
+        )
+
+    @classmethod
+    def from_pickles(cls, mlp_path=MLP_PATH, scaler_path=SCALER_PATH):
+        import joblib
+        return cls.from_sklearn(
+            joblib.load(scaler_path),
+            joblib.load(mlp_path),
+            fonte_sha1=_sha1_arquivos(mlp_path, scaler_path),
+        )
+
+    @classmethod
+    def load(cls, path=FUSED_PATH):
+        dados = np.load(path, allow_pickle=False)
+        n_camadas = int(dados["n_camadas"])
+        return cls(
+            [dados[f"w{i}"] for i in range(n_camadas)],
+            [dados[f"b{i}"] for i in range(n_camadas)],
+            dados["classes"],
+            activation=str(dados["activation"]),
+            out_activation=str(dados["out_activation"]),
+            fonte_sha1=str(dados["fonte_sha1"]),
+        )
+
+    def save(self, path=FUSED_PATH):
+        arrays = {f"w{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(
+            path,
+            n_camadas=len(self.weights),
+            classes=self.classes.astype(str),
+            activation=self.activation,
+            out_activation=self.out_activation,
+            fonte_sha1=self.fonte_sha1,
+            **arrays
+        )
+
+    # -------- inferência --------
+    def predict_proba(self, X):
+        """X: (n, 63) → (n, n_classes)"""
+        h = np.asarray(X, dtype=np.float32)
+        ultima = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            h = h @ w
+            h += b
+            if i < ultima:
+                h = self._act(h)
+
+        if self.out_activation == "softmax":
+            h -= h.max(axis=1, keepdims=True)
+            np.exp(h, out=h)
+            h /= h.sum(axis=1, keepdims=True)
+            return h
+        # Binário: uma saída logística
+        p = ACTIVATIONS[self.out_activation](h)
+        return np.hstack([1.0 - p, p])
+
+    def predict(self, X):
+        """Um só forward pass → (rótulos (n,), probabilidade do rótulo (n,))"""
+        proba = self.predict_proba(X)
+        idx = proba.argmax(axis=1)
+        return self.classes[idx], proba[np.arange(len(idx)), idx]
+
+
+def load_classifier(fused_path=FUSED_PATH, mlp_path=MLP_PATH, scaler_path=SCALER_PATH):
+    """
+    Usa o .npz exportado se ele veio dos .pkl atuais; senão refaz a fusão
+    a partir dos pickles (ex.: modelo re-treinado e ainda não exportado).
+    """
+    if os.path.exists(fused_path):
+        fused = FusedMLP.load(fused_path)
+        if fused.fonte_sha1 == _sha1_arquivos(mlp_path, scaler_path):
+            return fused
+        log.warning("%s desatualizado - usando os .pkl (rode python -m engine.mlp_numpy)", fused_path)
+    return FusedMLP.from_pickles(mlp_path, scaler_path)
+
+
+# -------- paridade com o sklearn --------
+def check_parity(fused, dados_path, mlp_path=MLP_PATH, scaler_path=SCALER_PATH):
+    """`dados_path`: dataset binário (engine/dataset.py) ou CSV antigo"""
+    import joblib
+
+    mlp = joblib.load(mlp_path)
+    scaler = joblib.load(scaler_path)
+    if dados_path.endswith(".csv"):
+        import pandas as pd
+        X = pd.read_csv(dados_path).iloc[:, :fused.n_features].values
+    else:
+        from engine.dataset import load_dataset
+        X = np.asarray(load_dataset(dados_path).X)
+
+    proba_sk = mlp.predict_proba(scaler.transform(X))
+    pred_sk = mlp.predict(scaler.transform(X))
+    pred_np, prob_np = fused.predict(X)
+
+    divergentes = int((pred_sk != pred_np).sum())
+    diff_prob = float(np.abs(proba_sk.max(axis=1) - prob_np).max())
+    diff_proba = float(np.abs(proba_sk - fused.predict_proba(X)).max())
+
+    # Caso do jogo: uma mão por vez
+    x1 = X[:1]
+    n = 500
+    t0 = time.perf_counter()
+    for _ in range(n):
+        a = scaler.transform(x1)
+        mlp.predict(a)
+        mlp.predict_proba(a)
+    t_sk = (time.perf_counter() - t0) / n * 1e6
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fused.predict(x1)
+    t_np = (time.perf_counter() - t0) / n * 1e6
+
+    print(f"Amostras: {len(X)} | rótulos divergentes: {divergentes}")
+    print(f"Diferença máx. prob. do rótulo: {diff_prob:.2e} | vetor de probs: {diff_proba:.2e}")
+    print(f"Por frame: sklearn {t_sk:.0f} µs | numpy {t_np:.0f} µs ({t_sk / t_np:.0f}x)")
+    return divergentes == 0 and diff_proba < 1e-4
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", default=FUSED_PATH)
+    parser.add_argument("--check", action="store_true", help="compara com o sklearn no dataset")
+    parser.add_argument("--dados", "--csv", default="data/landmarks",
+                        help="dataset binário (engine/dataset.py) ou CSV")
+    args = parser.parse_args()
+
+    fused = FusedMLP.from_pickles()
+    fused.save(args.out)
+    print(f"[MLP] Exportado {args.out} ({' → '.join(str(w.shape[1]) for w in fused.weights)})")
+
+    if args.check:
+        if not check_parity(fused, args.dados):
+            raise SystemExit("[MLP] ✗ Paridade com o sklearn falhou")
+        print("[MLP] ✓ Paridade com o sklearn OK")
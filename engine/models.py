@@ -0,0 +1,128 @@
+"""
+Registro dos modelos do engine (MediaPipe, classificador, YOLO).
+
+Nada é carregado no import: cada modelo é registrado com uma função de carga
+(e, opcionalmente, uma de warm-up, que roda uma inferência de mentira para
+o primeiro frame real não pagar inicialização de kernels/caches).
+
+- `get(nome)` carrega na hora se ainda não carregou (thread-safe: duas
+  threads pedindo o mesmo modelo esperam a mesma carga).
+- `start_background(on_ready)` carrega tudo numa thread enquanto a janela
+  e o menu já estão na tela; `on_ready(ok)` avisa quando terminou.
+
+Os tempos de carga e warm-up ficam em `tempos` e vão para o log.
+"""
+import threading
+import time
+
+from engine.log import get_logger
+
+log = get_logger("models")
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders = {}   # nome → (carga, warmup)
+        self._models = {}
+        self._erros = {}
+        self._locks = {}
+        self._ready = threading.Event()
+        self._thread = None
+        self.tempos = {}     # nome → {"carga_ms": ..., "warmup_ms": ...}
+
+    def register(self, nome, carga, warmup=None):
+        """`carga()` devolve o modelo; `warmup(modelo)` roda uma inferência de aquecimento"""
+        self._loaders[nome] = (carga, warmup)
+        self._locks[nome] = threading.Lock()
+
+    # -------- acesso --------
+    def get(self, nome):
+        """Modelo pronto para uso (carrega e aquece agora se preciso)"""
+        modelo = self._models.get(nome)
+        if modelo is not None:
+            return modelo
+        with self._locks[nome]:
+            if nome in self._erros:
+                raise self._erros[nome]  # Não tenta de novo a cada frame
+            if nome not in self._models:
+                self._load(nome)
+            return self._models[nome]
+
+    def peek(self, nome):
+        """Modelo se já carregou, senão None (não dispara carga)"""
+        return self._models.get(nome)
+
+    def replace(self, nome, modelo):
+        """Troca o modelo carregado (ex.: outro modo do MediaPipe); devolve o anterior"""
+        with self._locks[nome]:
+            antigo = self._models.get(nome)
+            self._models[nome] = modelo
+        return antigo
+
+    def reload(self, nome):
+        """
+        Carrega de novo com a carga e o warm-up registrados (ex.: outro modo do
+        MediaPipe) e troca o modelo; devolve o anterior, que o chamador fecha
+        """
+        with self._locks[nome]:
+            antigo = self._models.pop(nome, None)
+            self._erros.pop(nome, None)
+            self._load(nome)
+        return antigo
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    # -------- carga --------
+    def _load(self, nome):
+        carga, warmup = self._loaders[nome]
+        t0 = time.perf_counter()
+        try:
+            modelo = carga()
+            t1 = time.perf_counter()
+            if warmup is not None:
+                warmup(modelo)
+        except Exception as e:
+            self._erros[nome] = e
+            raise
+        t2 = time.perf_counter()
+        self._models[nome] = modelo
+        self.tempos[nome] = {"carga_ms": (t1 - t0) * 1000.0, "warmup_ms": (t2 - t1) * 1000.0}
+        log.info("[MODELOS] %s: carga %.0f ms, warm-up %.0f ms",
+                 nome, self.tempos[nome]["carga_ms"], self.tempos[nome]["warmup_ms"])
+
+    def load_all(self):
+        """Carrega todos os registrados, na ordem de registro; True se nenhum falhou"""
+        t0 = time.perf_counter()
+        ok = True
+        for nome in self._loaders:
+            try:
+                self.get(nome)
+            except Exception:
+                log.exception("[MODELOS] Falha ao carregar %s", nome)
+                ok = False
+        log.info("[MODELOS] Prontos em %.0f ms", (time.perf_counter() - t0) * 1000.0)
+        self._ready.set()
+        return ok
+
+    def start_background(self, on_ready=None):
+        """Carrega tudo numa thread; `on_ready(ok)` é chamado nela ao terminar"""
+        def run():
+            ok = self.load_all()
+            if on_ready is not None:
+                on_ready(ok)
+        self._thread = threading.Thread(target=run, name="modelos", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def format_timings(self):
+        return " ".join(
+            f"{nome}={t['carga_ms']:.0f}+{t['warmup_ms']:.0f}ms" for nome, t in self.tempos.items()
+        )
+
+
+# Instância usada pelo engine
+registry = ModelRegistry()
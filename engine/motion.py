@@ -0,0 +1,57 @@
+"""
+Detector de movimento barato para pular a inferência em cena parada.
+
+Cada frame vira uma miniatura em tons de cinza (64x48 por padrão) e é
+comparada com a miniatura do último frame que rodou inferência. Se poucos
+pixels mudaram, o engine reaproveita o último resultado de mãos e objetos
+em vez de chamar MediaPipe/YOLO. Mesmo parada, a cena é reprocessada a cada
+`refresh_s` segundos, para nada ficar velho demais.
+"""
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    `limiar_pixel`: diferença de cinza (0-255) para um pixel contar como mudado.
+    `fracao_min`: fração dos pixels da miniatura que precisa mudar.
+    """
+    def __init__(self, tamanho=(64, 48), limiar_pixel=18, fracao_min=0.01, refresh_s=1.0):
+        self.tamanho = tamanho
+        self.limiar_pixel = limiar_pixel
+        self.fracao_min = fracao_min
+        self.refresh_s = refresh_s
+
+        w, h = tamanho
+        self._mini = np.empty((h, w, 3), dtype=np.uint8)
+        self._cinza = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self._ref = np.empty((h, w), dtype=np.uint8)
+        self.executados = 0
+        self.pulados = 0
+        self.fracao = 0.0  # fração mudada no último frame (para calibrar o limiar)
+        self.reset()
+
+    def reset(self):
+        self._tem_ref = False
+        self._ultimo_ts = None
+
+    def changed(self, frame, ts, forcar=False):
+        """True se `frame` deve rodar inferência (e vira a nova referência)"""
+        cv2.resize(frame, self.tamanho, dst=self._mini, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._mini, cv2.COLOR_BGR2GRAY, dst=self._cinza)
+
+        mudou = forcar or not self._tem_ref or ts - self._ultimo_ts >= self.refresh_s
+        if self._tem_ref:
+            cv2.absdiff(self._cinza, self._ref, dst=self._diff)
+            self.fracao = np.count_nonzero(self._diff > self.limiar_pixel) / self._diff.size
+            mudou = mudou or self.fracao >= self.fracao_min
+
+        if not mudou:
+            self.pulados += 1
+            return False
+        self._ref[:] = self._cinza
+        self._tem_ref = True
+        self._ultimo_ts = ts
+        self.executados += 1
+        return True
@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import namedtuple
+
+from engine.log import get_logger
+from engine.profiler import profiler as default_profiler
+
+
+log = get_logger("engine.yolo")
+
+Deteccoes = namedtuple("Deteccoes", ["objetos", "ts"])
+
+
+class ObjectDetectorService(threading.Thread):
+    """
+    Roda o YOLO em background sempre sobre o frame mais recente.
+
+    `submit()` só troca o frame pendente (não enfileira), então o
+    rastreamento de mãos nunca espera pelo YOLO. `latest()` devolve as
+    detecções mais novas, desde que não sejam mais velhas que `max_age`.
+    `imgsz` é o lado da entrada da rede (None = o do modelo); menor roda
+    mais rápido e ainda acha objetos grandes como o gato.
+
+    A idade é medida no relógio dos `ts` passados ao `submit()` (o da
+    captura: time.monotonic() na câmera, o tempo do vídeo no replay).
+    Com `sincrono=True` (replay/avaliação offline) a thread não é usada:
+    `submit()` roda o YOLO na hora, em todo frame, e o resultado não depende
+    da velocidade da CPU.
+    """
+    def __init__(self, yolo, conf_min=0.6, max_age=1.0, imgsz=None, sincrono=False, profiler=None):
+        super().__init__(name="yolo", daemon=True)
+        self.yolo = yolo
+        self.conf_min = conf_min
+        self.max_age = max_age
+        self.imgsz = imgsz
+        self.sincrono = sincrono
+        self.profiler = profiler or default_profiler
+
+        self._pendente = None
+        self._resultado = Deteccoes([], 0.0)
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+
+        self.inferencias = 0
+        self.ultimo_tempo_ms = 0.0
+
+    # -------- API (thread de inferência) --------
+    def submit(self, frame, ts=None):
+        """Publica o frame mais novo para o YOLO; descarta o anterior não processado"""
+        if ts is None:
+            ts = time.monotonic()
+        if self.sincrono:
+            self._processar(frame, ts)
+            return
+        with self._cond:
+            self._pendente = (frame, ts)
+            self._cond.notify()
+
+    def latest(self, max_age=None, agora=None):
+        """
+        Detecções mais recentes (ou Deteccoes vazia se estiverem velhas demais).
+        `agora`: instante atual no relógio dos `ts` do submit (padrão time.monotonic())
+        """
+        max_age = self.max_age if max_age is None else max_age
+        if agora is None:
+            agora = time.monotonic()
+        resultado = self._resultado
+        if agora - resultado.ts > max_age:
+            return Deteccoes([], resultado.ts)
+        return resultado
+
+    def reset(self):
+        """Esquece o frame pendente e as detecções (ex.: antes de outro vídeo)"""
+        with self._cond:
+            self._pendente = None
+        self._resultado = Deteccoes([], 0.0)
+
+    def stop(self):
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    # -------- loop --------
+    def run(self):
+        while not self._stop_event.is_set():
+            with self._cond:
+                while self._pendente is None and not self._stop_event.is_set():
+                    self._cond.wait(0.1)
+                if self._stop_event.is_set():
+                    return
+                frame, ts = self._pendente
+                self._pendente = None
+            self._processar(frame, ts)
+
+    def _processar(self, frame, ts):
+        t0 = time.monotonic()
+        objetos = self._detect(frame)
+        dt = time.monotonic() - t0
+        self.ultimo_tempo_ms = dt * 1000.0
+        self.profiler.record("yolo", dt)
+        self.inferencias += 1
+        # Troca atômica da referência: leitores sempre veem um par consistente
+        self._resultado = Deteccoes(objetos, ts)
+
+    def _detect(self, frame):
+        objetos = []
+        if self.imgsz:
+            resultados_yolo = self.yolo(frame, imgsz=self.imgsz, verbose=False)
+        else:
+            resultados_yolo = self.yolo(frame, verbose=False)
+        for box in resultados_yolo[0].boxes:
+            cls = int(box.cls[0])
+            label = self.yolo.names[cls]
+            conf = float(box.conf[0])
+            if conf > self.conf_min:
+                objetos.append(label)
+                log.debug("Objeto detectado: %s (conf: %.2f)", label, conf)
+        return objetos
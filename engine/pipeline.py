@@ -0,0 +1,240 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from engine.log import get_logger
+from engine.profiler import profiler as default_profiler
+
+log = get_logger("pipeline")
+
+
+# -------- filas --------
+class DropOldestQueue:
+    """Fila limitada: quando cheia, descarta o item mais antigo"""
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Bloqueia até ter item (ou timeout/close); retorna None se não houver"""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def get_latest(self):
+        """Não bloqueia: pega o item mais novo e descarta os anteriores"""
+        with self._cond:
+            if not self._items:
+                return None
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FramePacket:
+    """Frame capturado + metadados que atravessam o pipeline"""
+    __slots__ = ("idx", "ts", "frame", "preview", "dados", "ts_inferencia")
+
+    def __init__(self, idx, ts, frame, preview=None):
+        self.idx = idx
+        self.ts = ts                # time.monotonic() da captura
+        self.frame = frame
+        self.preview = preview      # miniatura BGR para a GUI (PreviewRing)
+        self.dados = None           # resultado de process_frame
+        self.ts_inferencia = None   # fim da inferência
+
+
+# -------- preview --------
+class PreviewRing:
+    """
+    Miniatura BGR de cada frame para o preview da câmera, feita uma única vez
+    na captura com cv2.resize direto em buffers reaproveitados em rodízio.
+    A GUI copia o buffer para o seu (uma miniatura por tick) e o embrulha num
+    QImage (Format_BGR888), sem conversão.
+
+    O rodízio precisa ser maior que o número de frames em trânsito entre a
+    captura e quem lê a miniatura (filas + inferência + a cópia da GUI).
+    """
+    def __init__(self, size, tamanho=6):
+        self.size = size
+        self.tamanho = tamanho
+        self.buffers = None
+        self.pos = 0
+
+    def make(self, frame):
+        if self.buffers is None:
+            # Tamanho final só é conhecido no primeiro frame (mantém proporção)
+            h, w = frame.shape[:2]
+            escala = min(self.size[0] / w, self.size[1] / h)
+            pw, ph = max(1, round(w * escala)), max(1, round(h * escala))
+            self.buffers = [np.empty((ph, pw, 3), dtype=np.uint8) for _ in range(self.tamanho)]
+        buf = self.buffers[self.pos]
+        self.pos = (self.pos + 1) % self.tamanho
+        return cv2.resize(frame, (buf.shape[1], buf.shape[0]), dst=buf, interpolation=cv2.INTER_AREA)
+
+
+# -------- threads --------
+class CaptureThread(threading.Thread):
+    """
+    Lê a câmera sem parar e publica sempre o frame mais recente, tanto na
+    fila da inferência quanto em `ultimo` (slot lido pelo preview da GUI).
+    """
+    def __init__(self, cap, saida, profiler, preview=None):
+        super().__init__(name="captura", daemon=True)
+        self.cap = cap
+        self.saida = saida
+        self.profiler = profiler
+        self.preview = preview
+        self.ultimo = None  # FramePacket mais recente (atribuição é atômica)
+        self.falhas = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        idx = 0
+        while not self._stop_event.is_set():
+            t0 = time.monotonic()
+            ok, frame = self.cap.read()
+            t1 = time.monotonic()
+            if not ok:
+                self.falhas += 1
+                time.sleep(0.01)
+                continue
+            self.profiler.record("captura", t1 - t0)
+            preview = None
+            if self.preview is not None:
+                preview = self.preview.make(frame)
+                self.profiler.record("preview", time.monotonic() - t1)
+            packet = FramePacket(idx, t1, frame, preview)
+            self.ultimo = packet
+            self.saida.put(packet)
+            idx += 1
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class InferenceWorker(threading.Thread):
+    """Consome frames da captura, roda process_frame e publica o resultado"""
+    def __init__(self, entrada, saida, process_fn, on_result, profiler):
+        super().__init__(name="inferencia", daemon=True)
+        self.entrada = entrada
+        self.saida = saida
+        self.process_fn = process_fn
+        self.on_result = on_result
+        self.profiler = profiler
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            packet = self.entrada.get(timeout=0.1)
+            if packet is None:
+                continue
+            t0 = time.monotonic()
+            self.profiler.record("fila_captura", t0 - packet.ts)
+            try:
+                packet.dados = self.process_fn(packet.frame, packet.idx, packet.ts)
+            except Exception:
+                # Um frame com erro não pode matar a thread: o jogo só avança com resultados
+                log.exception("Erro na inferência do frame %d", packet.idx)
+                self.profiler.count("erros_inferencia")
+                continue
+            packet.ts_inferencia = time.monotonic()
+            self.profiler.record("inferencia", packet.ts_inferencia - t0)
+            self.saida.put(packet)
+            if self.on_result:
+                self.on_result()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# -------- pipeline --------
+class CVPipeline:
+    """
+    captura (thread) → inferência (thread) → GUI.
+
+    As filas entre os estágios são limitadas e descartam o item mais antigo,
+    então a GUI sempre recebe o resultado mais recente e a inferência roda
+    no ritmo que a CPU aguentar, sem travar animações e vídeo.
+    `on_result` é chamado na thread de inferência a cada resultado novo;
+    a GUI deve então chamar `poll_result()` na sua própria thread.
+    Latências vão para o profiler (captura, fila_captura, inferencia,
+    fila_gui, total) e os descartes para os seus contadores.
+    Com `preview_size` cada pacote leva também `preview`, a miniatura do
+    frame já no tamanho do preview da GUI; `latest_frame()` dá o pacote mais
+    novo da captura, para a GUI mostrar a câmera no ritmo da captura e não
+    no da inferência.
+    """
+    def __init__(self, cap, process_fn, on_result=None, queue_size=1, profiler=None, preview_size=None):
+        self.profiler = profiler or default_profiler
+        self.fila_frames = DropOldestQueue(queue_size)
+        self.fila_resultados = DropOldestQueue(queue_size)
+        preview = PreviewRing(preview_size) if preview_size else None
+        self.captura = CaptureThread(cap, self.fila_frames, self.profiler, preview)
+        self.inferencia = InferenceWorker(
+            self.fila_frames, self.fila_resultados, process_fn, on_result, self.profiler
+        )
+
+    def start(self):
+        self.captura.start()
+        self.inferencia.start()
+
+    def stop(self, timeout=1.0):
+        self.captura.stop()
+        self.inferencia.stop()
+        self.fila_frames.close()
+        self.fila_resultados.close()
+        for t in (self.captura, self.inferencia):
+            if t.is_alive():
+                t.join(timeout)
+
+    def latest_frame(self):
+        """Pacote mais recente da captura (ainda sem inferência) ou None"""
+        return self.captura.ultimo
+
+    def poll_result(self):
+        """Chamado na thread da GUI: retorna o pacote mais recente (ou None)"""
+        packet = self.fila_resultados.get_latest()
+        if packet is not None:
+            agora = time.monotonic()
+            self.profiler.record("fila_gui", agora - packet.ts_inferencia)
+            self.profiler.record("total", agora - packet.ts)
+        self.profiler.set_counter("descartados_captura", self.fila_frames.dropped)
+        self.profiler.set_counter("descartados_gui", self.fila_resultados.dropped)
+        self.profiler.set_counter("falhas_captura", self.captura.falhas)
+        return packet
+
+    def format_report(self):
+        s = self.profiler.summary()
+        partes = [
+            f"{nome}={st['p50_ms']:.1f}/{st['p95_ms']:.0f}ms"
+            for nome, st in s["stages"].items()
+        ]
+        c = s["counters"]
+        return (" ".join(partes)
+                + f" | descartados captura={c.get('descartados_captura', 0)}"
+                + f" gui={c.get('descartados_gui', 0)}"
+                + f" | falhas={c.get('falhas_captura', 0)}")
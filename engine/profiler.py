@@ -0,0 +1,132 @@
+"""
+Medição de tempo por estágio do frame (captura, MediaPipe, MLP, YOLO, UI...).
+
+Cada estágio guarda as últimas N durações num ring buffer pré-alocado, então
+gravar custa dois perf_counter e uma escrita em array. `summary()` calcula
+p50/p95/p99 e a taxa (fps) de cada estágio na janela; `dump_json()` salva o
+resumo e as amostras cruas para analisar travadas depois.
+
+Uso: `with profiler.stage("mediapipe"): ...` ou `profiler.record(nome, segundos)`.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class StageRing:
+    """Últimas `tamanho` durações (s) e instantes de fim de um estágio"""
+    def __init__(self, tamanho):
+        self.duracoes = np.zeros(tamanho, dtype=np.float64)
+        self.instantes = np.zeros(tamanho, dtype=np.float64)
+        self.pos = 0
+        self.count = 0
+
+    def add(self, duracao, instante):
+        self.duracoes[self.pos] = duracao
+        self.instantes[self.pos] = instante
+        self.pos = (self.pos + 1) % len(self.duracoes)
+        self.count += 1
+
+    def janela(self):
+        """Cópia das amostras válidas em ordem cronológica"""
+        n = min(self.count, len(self.duracoes))
+        if n < len(self.duracoes):
+            return self.duracoes[:n].copy(), self.instantes[:n].copy()
+        ordem = np.r_[self.pos:len(self.duracoes), 0:self.pos]
+        return self.duracoes[ordem], self.instantes[ordem]
+
+
+class Profiler:
+    def __init__(self, tamanho=600):
+        self.tamanho = tamanho
+        self.enabled = True
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    # -------- gravação --------
+    def record(self, nome, segundos):
+        if not self.enabled:
+            return
+        agora = time.perf_counter()
+        with self._lock:
+            ring = self._stages.get(nome)
+            if ring is None:
+                ring = self._stages[nome] = StageRing(self.tamanho)
+            ring.add(segundos, agora)
+
+    @contextmanager
+    def stage(self, nome):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(nome, time.perf_counter() - t0)
+
+    def set_counter(self, nome, valor):
+        self._counters[nome] = valor
+
+    def count(self, nome, n=1):
+        with self._lock:
+            self._counters[nome] = self._counters.get(nome, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    # -------- leitura --------
+    def summary(self):
+        with self._lock:
+            janelas = {nome: ring.janela() for nome, ring in self._stages.items()}
+            counters = dict(self._counters)
+
+        stages = {}
+        for nome, (duracoes, instantes) in janelas.items():
+            if len(duracoes) == 0:
+                continue
+            ms = duracoes * 1000.0
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            span = instantes[-1] - instantes[0]
+            stages[nome] = {
+                "n": int(len(ms)),
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(ms.max()),
+                "fps": float((len(ms) - 1) / span) if span > 0 else 0.0,
+            }
+        return {"stages": stages, "counters": counters}
+
+    def format_summary(self):
+        s = self.summary()
+        linhas = [f"{'estágio':<14}{'p50':>7}{'p95':>7}{'p99':>7}{'fps':>6}"]
+        for nome, st in s["stages"].items():
+            linhas.append(
+                f"{nome:<14}{st['p50_ms']:>7.1f}{st['p95_ms']:>7.1f}{st['p99_ms']:>7.1f}{st['fps']:>6.0f}"
+            )
+        for nome, valor in s["counters"].items():
+            linhas.append(f"{nome}: {valor}")
+        return "\n".join(linhas)
+
+    def dump_json(self, path):
+        """Resumo + amostras cruas (ms, em ordem) de cada estágio"""
+        dados = self.summary()
+        with self._lock:
+            janelas = {nome: ring.janela() for nome, ring in self._stages.items()}
+        dados["amostras_ms"] = {
+            nome: [round(d * 1000.0, 3) for d in duracoes]
+            for nome, (duracoes, _) in janelas.items()
+        }
+        dados["criado_em"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        with open(path, "w") as f:
+            json.dump(dados, f, indent=2)
+        return path
+
+
+# Instância compartilhada por engine, pipeline e UI
+profiler = Profiler()
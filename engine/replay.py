@@ -0,0 +1,125 @@
+"""
+Replay headless de vídeos gravados pelo pipeline do jogo.
+
+Substitui a webcam por um arquivo: cada frame passa por `process_fn`
+(normalmente engine.cv_engine.process_frame) e, opcionalmente, por
+`GameState.update`, o mais rápido possível. Os tempos por estágio vêm do
+profiler passado (padrão: o compartilhado; use o mesmo do engine, ex.:
+CVEngine.profiler), então dá para comparar execuções entre si.
+
+O `ts` de cada frame é o tempo do próprio vídeo, não o relógio do sistema:
+quem processa deve usar só ele (ex.: CVEngine(yolo_sincrono=True)).
+"""
+import os
+import resource
+import time
+
+import cv2
+
+from engine.profiler import profiler as default_profiler
+
+
+def iter_video(path, max_frames=None, profiler=None):
+    """(idx, ts em segundos do próprio vídeo, frame BGR)"""
+    profiler = profiler or default_profiler
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Não abriu o vídeo: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    idx = 0
+    try:
+        while max_frames is None or idx < max_frames:
+            t0 = time.perf_counter()
+            ok, frame = cap.read()
+            if not ok:
+                break
+            profiler.record("decode", time.perf_counter() - t0)
+            yield idx, idx / fps, frame
+            idx += 1
+    finally:
+        cap.release()
+
+
+def rss_mb():
+    """Memória residente atual (Linux) ou None"""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def pico_rss_mb():
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux devolve KB, macOS devolve bytes
+    return maxrss / 1024 if os.uname().sysname != "Darwin" else maxrss / 2**20
+
+
+def replay(path, process_fn, game=None, max_frames=None, on_frame=None, profiler=None):
+    """
+    Roda o vídeo inteiro (ou `max_frames`) e devolve um relatório com
+    throughput, percentis por estágio e memória.
+
+    `on_frame(idx, ts, dados, evento)` é chamado a cada frame (para quem
+    quiser avaliar as predições, ex.: acurácia por clipe). `profiler` é
+    zerado no começo.
+    """
+    profiler = profiler or default_profiler
+    profiler.reset()
+    rss_inicio = rss_mb()
+    frames = 0
+    eventos = 0
+
+    t0 = time.perf_counter()
+    for idx, ts, frame in iter_video(path, max_frames, profiler):
+        with profiler.stage("process_frame"):
+            dados = process_fn(frame, idx, ts)
+
+        evento = None
+        if game is not None:
+            with profiler.stage("game_update"):
+                evento = game.update(dados.get("gesto0"), dados.get("gesto1"), dados.get("objetos", []))
+            if evento:
+                eventos += 1
+
+        if on_frame is not None:
+            on_frame(idx, ts, dados, evento)
+        frames += 1
+    tempo = time.perf_counter() - t0
+
+    resumo = profiler.summary()
+    return {
+        "clipe": path,
+        "frames": frames,
+        "tempo_s": tempo,
+        "throughput_fps": frames / tempo if tempo > 0 else 0.0,
+        "eventos": eventos,
+        "stages": resumo["stages"],
+        "counters": resumo["counters"],
+        "memoria": {
+            "rss_inicio_mb": rss_inicio,
+            "rss_fim_mb": rss_mb(),
+            "rss_pico_mb": pico_rss_mb(),
+        },
+    }
+
+
+def compare(atual, baseline, tolerancia=0.10, min_ms=0.5):
+    """
+    Regressões de `atual` contra `baseline` (relatórios de replay() do mesmo
+    clipe): throughput menor ou p95 de estágio maior que a tolerância.
+    Diferenças de p95 abaixo de `min_ms` são ruído e não contam.
+    """
+    regressoes = []
+    base_fps = baseline.get("throughput_fps", 0.0)
+    if base_fps and atual["throughput_fps"] < base_fps * (1 - tolerancia):
+        regressoes.append(("throughput_fps", base_fps, atual["throughput_fps"]))
+
+    for nome, st in atual["stages"].items():
+        base = baseline.get("stages", {}).get(nome)
+        if not base or st["p95_ms"] - base["p95_ms"] < min_ms:
+            continue
+        if st["p95_ms"] > base["p95_ms"] * (1 + tolerancia):
+            regressoes.append((f"{nome}.p95_ms", base["p95_ms"], st["p95_ms"]))
+    return regressoes
@@ -0,0 +1,109 @@
+"""
+Região de interesse das mãos para o MediaPipe.
+
+Depois que as mãos aparecem, o próximo frame só manda para o MediaPipe um
+recorte em volta das caixas delas (com margem), em vez dos 640x480 inteiros.
+A cada `reacquire_every` frames, ou quando as mãos somem do recorte, volta a
+olhar o frame todo para achar mãos novas.
+
+Os landmarks que saem do recorte são remapeados para coordenadas
+normalizadas do frame inteiro (z na mesma escala de x), então o resto do
+engine (features, classificador) não percebe a diferença.
+
+Só serve para o HandLandmarker no modo IMAGE (cada frame independente): nos
+modos VIDEO/LIVE_STREAM o MediaPipe guarda a região da mão nas coordenadas do
+frame anterior, e um recorte que muda estraga esse rastreamento.
+"""
+import cv2
+
+
+class HandROI:
+    """
+    `margem`: fração do maior lado da caixa das mãos somada em cada lado.
+    `min_lado`: recorte nunca menor que isso (px), para o detector de palma ter contexto.
+    `grade`: bordas do recorte alinhadas a múltiplos disso, para o recorte não
+    tremer de um frame para o outro.
+    """
+    def __init__(self, margem=0.35, reacquire_every=15, min_lado=192, grade=32, ativo=True):
+        self.margem = margem
+        self.reacquire_every = reacquire_every
+        self.min_lado = min_lado
+        self.grade = grade
+        self.ativo = ativo
+        self.reset()
+
+    def reset(self):
+        self._caixa = None  # (x0, y0, x1, y1) das mãos no último frame, em px
+        self._desde_full = 0
+
+    def region(self, shape):
+        """(x0, y0, x1, y1) a mandar para o detector neste frame"""
+        H, W = shape[:2]
+        if not self.ativo or self._caixa is None or self._desde_full >= self.reacquire_every:
+            return 0, 0, W, H
+
+        x0, y0, x1, y1 = self._caixa
+        lado = max(x1 - x0, y1 - y0)
+        m = self.margem * lado
+        x0, y0, x1, y1 = x0 - m, y0 - m, x1 + m, y1 + m
+
+        # Garante o tamanho mínimo crescendo em volta do centro
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        meio_w = max(x1 - x0, self.min_lado) / 2
+        meio_h = max(y1 - y0, self.min_lado) / 2
+        g = self.grade
+        x0 = max(0, int(cx - meio_w) // g * g)
+        y0 = max(0, int(cy - meio_h) // g * g)
+        x1 = min(W, -(-int(cx + meio_w) // g) * g)
+        y1 = min(H, -(-int(cy + meio_h) // g) * g)
+        return x0, y0, x1, y1
+
+    def crop(self, frame):
+        """(view do recorte, região) para este frame"""
+        x0, y0, x1, y1 = regiao = self.region(frame.shape)
+        return frame[y0:y1, x0:x1], regiao
+
+    def update(self, hand_landmarks, regiao, shape):
+        """
+        Remapeia (in place) os landmarks do recorte `regiao` para o frame
+        inteiro e guarda a caixa das mãos para o próximo frame. Devolve se
+        `regiao` era o frame inteiro.
+        """
+        H, W = shape[:2]
+        x0, y0, x1, y1 = regiao
+        full = (x0, y0, x1, y1) == (0, 0, W, H)
+        self._desde_full = 0 if full else self._desde_full + 1
+
+        if not hand_landmarks:
+            self._caixa = None  # Perdeu as mãos: próximo frame olha tudo
+            return full
+
+        if not full:
+            sx, sy = (x1 - x0) / W, (y1 - y0) / H
+            ox, oy = x0 / W, y0 / H
+            for mao in hand_landmarks:
+                for lm in mao:
+                    lm.x = ox + lm.x * sx
+                    lm.y = oy + lm.y * sy
+                    lm.z = lm.z * sx
+
+        bx0 = by0 = float("inf")
+        bx1 = by1 = float("-inf")
+        for mao in hand_landmarks:
+            for lm in mao:
+                bx0, bx1 = min(bx0, lm.x), max(bx1, lm.x)
+                by0, by1 = min(by0, lm.y), max(by1, lm.y)
+        self._caixa = (bx0 * W, by0 * H, bx1 * W, by1 * H)
+        return full
+
+
+def downscale(imagem, max_lado, dst=None):
+    """Reduz `imagem` para o maior lado caber em `max_lado` (None ou já menor: devolve igual)"""
+    h, w = imagem.shape[:2]
+    if not max_lado or max(h, w) <= max_lado:
+        return imagem
+    escala = max_lado / max(h, w)
+    size = (max(1, round(w * escala)), max(1, round(h * escala)))
+    if dst is not None and dst.shape[:2] != (size[1], size[0]):
+        dst = None
+    return cv2.resize(imagem, size, dst=dst, interpolation=cv2.INTER_AREA)
@@ -0,0 +1,153 @@
+"""
+Suavização temporal das predições de gesto, por mão.
+
+Cada estratégia recebe, a cada frame, o vetor de probabilidades do
+classificador (n_classes) e devolve (índice da classe, probabilidade), com
+custo constante por frame, não importa o tamanho da janela:
+
+- "voto":      maioria nos últimos `janela` frames (contagem por classe e soma
+               das probabilidades mantidas incrementalmente num ring buffer)
+- "ema":       média móvel exponencial do vetor de probabilidades inteiro
+- "histerese": EMA + limiares: só entra num gesto com prob >= `entrar` e só
+               sai dele quando cai abaixo de `sair` (sem piscar na fronteira)
+
+Índice -1 = nenhum gesto (só a histerese devolve).
+"""
+import numpy as np
+
+
+class MajorityVote:
+    """
+    Maioria da janela, como o antigo deque + Counter, em O(1) por frame.
+    Empate como o Counter.most_common: vence a classe empatada que está há
+    mais tempo na janela (só no empate a janela é percorrida)
+    """
+    def __init__(self, n_classes, janela=7):
+        self.janela = janela
+        self.contagem = np.zeros(n_classes, dtype=np.int32)
+        self._classes = np.zeros(janela, dtype=np.int32)
+        self._probs = np.zeros(janela, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self.contagem[:] = 0
+        self._pos = 0
+        self._n = 0
+        self._soma = 0.0
+
+    def update(self, proba):
+        idx = int(proba.argmax())
+        prob = float(proba[idx])
+        if self._n == self.janela:
+            # Janela cheia: tira o mais antigo antes de pôr o novo
+            self.contagem[self._classes[self._pos]] -= 1
+            self._soma -= self._probs[self._pos]
+        else:
+            self._n += 1
+        self._classes[self._pos] = idx
+        self._probs[self._pos] = prob
+        self.contagem[idx] += 1
+        self._soma += prob
+        self._pos = (self._pos + 1) % self.janela
+        return self._maioria(), max(0.0, self._soma / self._n)
+
+    def _maioria(self):
+        melhor = int(self.contagem.argmax())
+        maximo = self.contagem[melhor]
+        if (self.contagem == maximo).sum() == 1:
+            return melhor
+        # Empate: do mais antigo para o mais novo, a primeira classe empatada
+        inicio = self._pos if self._n == self.janela else 0
+        for i in range(self._n):
+            classe = self._classes[(inicio + i) % self.janela]
+            if self.contagem[classe] == maximo:
+                return int(classe)
+        return melhor
+
+
+class EMA:
+    def __init__(self, n_classes, alpha=0.4):
+        self.alpha = alpha
+        self.media = np.zeros(n_classes, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self._vazio = True
+
+    def update(self, proba):
+        if self._vazio:
+            self.media[:] = proba
+            self._vazio = False
+        else:
+            self.media *= 1.0 - self.alpha
+            self.media += self.alpha * proba
+        idx = int(self.media.argmax())
+        return idx, float(self.media[idx])
+
+
+class Hysteresis:
+    def __init__(self, n_classes, entrar=0.7, sair=0.45, alpha=0.4):
+        self.entrar = entrar
+        self.sair = sair
+        self.ema = EMA(n_classes, alpha)
+        self.reset()
+
+    def reset(self):
+        self.ema.reset()
+        self.atual = -1
+
+    def update(self, proba):
+        melhor, prob = self.ema.update(proba)
+        media = self.ema.media
+        if self.atual >= 0 and media[self.atual] >= self.sair:
+            if melhor != self.atual and prob >= self.entrar:
+                self.atual = melhor  # Outro gesto ficou claramente mais forte
+        elif prob >= self.entrar:
+            self.atual = melhor
+        else:
+            self.atual = -1
+        if self.atual < 0:
+            return -1, prob
+        return self.atual, float(media[self.atual])
+
+
+ESTRATEGIAS = {
+    "voto": MajorityVote,
+    "ema": EMA,
+    "histerese": Hysteresis,
+}
+
+
+class GestureSmoother:
+    """
+    Um suavizador por mão. A chave é qualquer identificador estável da mão
+    (posição na saída do MediaPipe, id de track...); estado novo é criado na
+    primeira vez que a chave aparece.
+    """
+    def __init__(self, classes, estrategia="voto", nenhum="Nenhum", **params):
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estratégia inválida: {estrategia} (use {', '.join(ESTRATEGIAS)})")
+        self.classes = classes
+        self.estrategia = estrategia
+        self.nenhum = nenhum
+        self.params = params
+        self._estados = {}
+
+    def update(self, chave, proba):
+        """Vetor de probabilidades do frame → (rótulo suavizado, probabilidade)"""
+        estado = self._estados.get(chave)
+        if estado is None:
+            estado = self._estados[chave] = ESTRATEGIAS[self.estrategia](len(self.classes), **self.params)
+        idx, prob = estado.update(proba)
+        if idx < 0:
+            return self.nenhum, prob
+        return self.classes[idx], prob
+
+    def remove(self, chave):
+        self._estados.pop(chave, None)
+
+    def chaves(self):
+        return list(self._estados)
+
+    def reset(self):
+        self._estados.clear()
@@ -0,0 +1,85 @@
+"""
+Identidade das mãos entre frames.
+
+O MediaPipe não garante a ordem das mãos na saída: de um frame para o
+outro a mão 0 pode virar a 1. O tracker casa cada mão com a track do frame
+anterior pela posição do pulso (e pela lateralidade, quando bate), e dá a
+cada track um id estável; a suavização guarda estado por id, então
+predições de mãos diferentes nunca se misturam.
+
+Track que fica `timeout_s` sem aparecer é descartada.
+"""
+from engine.features import WRIST
+
+
+class Track:
+    __slots__ = ("id", "x", "y", "lado", "visto_em")
+
+    def __init__(self, id, x, y, lado, visto_em):
+        self.id = id
+        self.x = x
+        self.y = y
+        self.lado = lado
+        self.visto_em = visto_em
+
+
+class HandTracker:
+    """
+    `dist_max`: distância máxima do pulso (coordenadas normalizadas) para
+    continuar a mesma track. `penalidade_lado`: custo extra quando a
+    lateralidade ("Left"/"Right") difere (o MediaPipe às vezes troca, então
+    não é proibido, só desempata).
+    """
+    def __init__(self, dist_max=0.2, penalidade_lado=0.1, timeout_s=0.5):
+        self.dist_max = dist_max
+        self.penalidade_lado = penalidade_lado
+        self.timeout_s = timeout_s
+        self.tracks = {}
+        self._proximo_id = 0
+
+    def reset(self):
+        self.tracks.clear()
+
+    def update(self, hand_landmarks, handedness, ts):
+        """
+        Mãos do frame (na ordem do MediaPipe) → (ids das tracks na mesma
+        ordem, ids das tracks que expiraram neste frame).
+        """
+        maos = []
+        for i, mao in enumerate(hand_landmarks):
+            lado = handedness[i][0].category_name if handedness and i < len(handedness) else None
+            maos.append((mao[WRIST].x, mao[WRIST].y, lado))
+
+        # Pares (custo, mão, track) dentro do limite, casados do mais barato ao mais caro
+        pares = []
+        for i, (x, y, lado) in enumerate(maos):
+            for track in self.tracks.values():
+                dist = ((x - track.x) ** 2 + (y - track.y) ** 2) ** 0.5
+                if dist > self.dist_max:
+                    continue
+                if lado is not None and track.lado is not None and lado != track.lado:
+                    dist += self.penalidade_lado
+                pares.append((dist, i, track.id))
+        pares.sort()
+
+        ids = [None] * len(maos)
+        usadas = set()
+        for _, i, tid in pares:
+            if ids[i] is None and tid not in usadas:
+                ids[i] = tid
+                usadas.add(tid)
+
+        for i, (x, y, lado) in enumerate(maos):
+            if ids[i] is None:
+                ids[i] = self._proximo_id
+                self._proximo_id += 1
+                self.tracks[ids[i]] = Track(ids[i], x, y, lado, ts)
+            else:
+                track = self.tracks[ids[i]]
+                track.x, track.y, track.visto_em = x, y, ts
+                track.lado = lado or track.lado
+
+        expiradas = [tid for tid, t in self.tracks.items() if ts - t.visto_em > self.timeout_s]
+        for tid in expiradas:
+            del self.tracks[tid]
+        return ids, expiradas
@@ -0,0 +1,181 @@
+# ===================== Avaliação offline de sessões gravadas =======================
+#
+# Roda cada vídeo de um diretório pelo engine completo (CVEngine) e confere se
+# a fase esperada seria concluída, com os vídeos divididos entre processos
+# (um CVEngine por processo). Serve para validar um modelo novo
+# (models/modelo_mlp.pkl) sem ficar na frente da câmera.
+#
+# Rótulos no mesmo formato das fases do app_qt.py, em <video>.json ao lado do
+# vídeo ou num labels.json do diretório ({"clipe.mp4": {...}, ...}):
+#
+#   {"tipo": "gesto_duplo", "gestos": ["A", "B"]}
+#   {"tipo": "objeto", "objeto": "cat", "inicio": 1.5}   # ignora o 1.5s inicial
+#   {"tipo": "gesto_unico", "gesto": "A", "positivo": false}  # não pode concluir
+#
+#   python eval-sessions.py sessoes/
+#   python eval-sessions.py sessoes/ --workers 4 --out eval/modelo_novo.json
+#
+
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv")
+
+_engine = None  # um por processo worker
+
+
+def carregar_rotulos(diretorio):
+    """{caminho do vídeo: fase esperada} para os vídeos com rótulo"""
+    geral = {}
+    labels_path = os.path.join(diretorio, "labels.json")
+    if os.path.exists(labels_path):
+        with open(labels_path) as f:
+            geral = json.load(f)
+
+    rotulos = {}
+    for path in sorted(glob.glob(os.path.join(diretorio, "*"))):
+        if not path.lower().endswith(VIDEO_EXTS):
+            continue
+        sidecar = os.path.splitext(path)[0] + ".json"
+        if os.path.exists(sidecar):
+            with open(sidecar) as f:
+                rotulos[path] = json.load(f)
+        elif os.path.basename(path) in geral:
+            rotulos[path] = geral[os.path.basename(path)]
+    return rotulos
+
+
+def cumpre(fase, dados):
+    """A fase seria concluída com este resultado? (a mesma regra do GameState.update)"""
+    from engine.game_logic import GameState
+    jogo = GameState([fase])
+    jogo.menu_active = False
+    jogo.fase_atual = 0
+    return jogo.update(dados.get("gesto0"), dados.get("gesto1"), dados.get("objetos", [])) == "fase_ok"
+
+
+# -------- worker --------
+def iniciar_worker(modo):
+    global _engine
+    # Vários processos em paralelo: cada um com uma thread de BLAS/torch/OpenCV
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    import atexit
+    import cv2
+    from engine.cv_engine import CVEngine
+    cv2.setNumThreads(1)
+    logging.getLogger("gift.game").setLevel(logging.WARNING)  # um "✓" por frame não ajuda aqui
+    # YOLO síncrono: todo frame é detectado, não importa a velocidade do processo
+    _engine = CVEngine(running_mode=modo, yolo_sincrono=True)
+    atexit.register(_engine.close)
+
+
+def avaliar_clipe(path, fase):
+    from engine.game_logic import DETECTORES_POR_TIPO
+    from engine.replay import replay
+
+    detectores = DETECTORES_POR_TIPO[fase["tipo"]]
+    inicio = fase.get("inicio", 0.0)
+    positivo = fase.get("positivo", True)
+    contagem = {"frames": 0, "acertos": 0, "primeira": None}
+
+    def on_frame(idx, ts, dados, evento):
+        if ts < inicio:
+            return
+        ok = cumpre(fase, dados)
+        contagem["frames"] += 1
+        contagem["acertos"] += ok == positivo
+        if ok and contagem["primeira"] is None:
+            contagem["primeira"] = ts - inicio
+
+    _engine.reset()
+    r = replay(path, lambda frame, idx, ts: _engine.process(frame, ts, detectores), on_frame=on_frame,
+               profiler=_engine.profiler)
+    n = contagem["frames"]
+    return {
+        "clipe": path,
+        "fase": fase,
+        "frames": r["frames"],
+        "acuracia": contagem["acertos"] / n if n else None,
+        # positivo: quanto demorou para reconhecer; negativo: primeiro falso positivo
+        "tempo_deteccao_s": contagem["primeira"],
+        "throughput_fps": r["throughput_fps"],
+        "stages": {nome: {"p50_ms": st["p50_ms"], "p95_ms": st["p95_ms"]} for nome, st in r["stages"].items()},
+    }
+
+
+# -------- relatório --------
+def agregar(resultados, tempo):
+    positivos = [r for r in resultados if r["fase"].get("positivo", True)]
+    detectados = [r for r in positivos if r["tempo_deteccao_s"] is not None]
+    falsos = [r for r in resultados if not r["fase"].get("positivo", True) and r["tempo_deteccao_s"] is not None]
+    acuracias = [r["acuracia"] for r in resultados if r["acuracia"] is not None]
+    tempos = sorted(r["tempo_deteccao_s"] for r in detectados)
+    frames = sum(r["frames"] for r in resultados)
+    return {
+        "clipes": len(resultados),
+        "acuracia_media": sum(acuracias) / len(acuracias) if acuracias else None,
+        "detectados": f"{len(detectados)}/{len(positivos)}",
+        "falsos_positivos": len(falsos),
+        "tempo_deteccao_mediano_s": tempos[len(tempos) // 2] if tempos else None,
+        "tempo_total_s": tempo,
+        "throughput_total_fps": frames / tempo if tempo > 0 else 0.0,
+    }
+
+
+def fmt(valor, formato):
+    return "-" if valor is None else format(valor, formato)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("diretorio", help="vídeos + rótulos (<video>.json ou labels.json)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processos em paralelo")
+    parser.add_argument("--modo", choices=["image", "video", "live_stream"], default="video",
+                        help="modo do HandLandmarker")
+    parser.add_argument("--out", help="salva o relatório em JSON")
+    args = parser.parse_args()
+
+    rotulos = carregar_rotulos(args.diretorio)
+    if not rotulos:
+        raise SystemExit(f"Nenhum vídeo rotulado em {args.diretorio}")
+
+    workers = max(1, min(args.workers, len(rotulos)))
+    print(f"{len(rotulos)} clipes em {workers} processos")
+
+    resultados = []
+    t0 = time.perf_counter()
+    # spawn: cada worker começa limpo (sem threads/modelos herdados do pai)
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=contexto,
+                             initializer=iniciar_worker, initargs=(args.modo,)) as pool:
+        futuros = {pool.submit(avaliar_clipe, path, fase): path for path, fase in rotulos.items()}
+        for futuro in as_completed(futuros):
+            try:
+                r = futuro.result()
+            except Exception as e:
+                print(f"   ✗ {futuros[futuro]}: {e}")
+                continue
+            resultados.append(r)
+            print(f"   {os.path.basename(r['clipe']):<28} acurácia {fmt(r['acuracia'], '>6.1%')}"
+                  f"  detecção {fmt(r['tempo_deteccao_s'], '>5.2f')}s"
+                  f"  {r['throughput_fps']:>6.1f} fps")
+    tempo = time.perf_counter() - t0
+
+    resultados.sort(key=lambda r: r["clipe"])
+    resumo = agregar(resultados, tempo)
+    print(f"\n== {resumo['clipes']} clipes em {tempo:.1f}s ({resumo['throughput_total_fps']:.1f} fps no total)")
+    print(f"   acurácia média {fmt(resumo['acuracia_media'], '.1%')} | detectados {resumo['detectados']}"
+          f" | falsos positivos {resumo['falsos_positivos']}"
+          f" | detecção mediana {fmt(resumo['tempo_deteccao_mediano_s'], '.2f')}s")
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump({"modo": args.modo, "resumo": resumo, "clipes": resultados}, f, indent=2)
+        print(f"\nRelatório salvo em {args.out}")
@@ -7,26 +7,10 @@ import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 import time
-import pandas as pd
 
+from engine.dataset import DatasetWriter
+from engine.features import LandmarkFeatures
 
-# ===================== Funções Auxiliares =======================
-
-
-# ----- Função para normalizar coordenadas em referência ao pulso --------
-
-def coords_norm(landmark_list):
-    x0 = landmark_list[0].x
-    y0 = landmark_list[0].y
-    z0 = landmark_list[0].z
-
-    temp_landmark_list = []
-    for lm in landmark_list:
-        temp_landmark_list.append(lm.x - x0)   
-        temp_landmark_list.append(lm.y - y0)   
-        temp_landmark_list.append(lm.z - z0)   
-
-    return temp_landmark_list
 
 # ============ Configurando o MediaPipe ==================
 
@@ -52,10 +36,12 @@ options = HandLandmarkerOptions(
 
 # ============== Configura Res e ademais utilidades do OpenCV ===================
 
-dataset = []
+# Acrescenta em data/landmarks/ (engine/dataset.py); cada execução é uma sessão
+dataset = DatasetWriter("data/landmarks", fonte="get-data-opencv.py")
 modo_gravacao = None
 frames_restantes = 0
 contador = {"A":0, "B":0, "C":0, "D":0, "E":0}
+features = LandmarkFeatures(max_hands=1) # Mesmas features do jogo (engine/features.py)
 
 with HandLandmarker.create_from_options(options) as detector:
     camera = cv2.VideoCapture(0)
@@ -79,10 +65,10 @@ with HandLandmarker.create_from_options(options) as detector:
 
         # ---- Desenhar linhas e points do MediaPipe --------
 
-        coords_wrist = [] # Para normalizar em relação ao pulso
+        coords_wrist = None # Para normalizar em relação ao pulso
         if resultados.hand_landmarks:
+            coords_wrist = features.extrair(resultados.hand_landmarks)
             for hand_landmarks in resultados.hand_landmarks:
-                coords_wrist.extend(coords_norm(hand_landmarks)) # Para normalizar em relação ao pulso
                 for landmark in hand_landmarks:
                     x = int(landmark.x * imagem.shape[1])
                     y = int(landmark.y * imagem.shape[0])
@@ -109,12 +95,13 @@ with HandLandmarker.create_from_options(options) as detector:
 
         # ----------- Grava Coords -------------
 
-        if modo_gravacao is not None and len(coords_wrist) > 0:
-            dataset.append(coords_wrist + [modo_gravacao])
+        if modo_gravacao is not None and coords_wrist is not None:
+            dataset.append(coords_wrist, modo_gravacao)
             contador[modo_gravacao] += 1
             frames_restantes -= 1
             if frames_restantes <= 0:
                 modo_gravacao = None
+                dataset.flush() # Fim da rajada: já fica salvo no disco
 
         
         for i, (gesto, total) in enumerate(contador.items()):
@@ -139,8 +126,7 @@ with HandLandmarker.create_from_options(options) as detector:
 
 # =========== Salva os Dados ===========
 
-df = pd.DataFrame(dataset)
-df.to_csv("data/coords_to_train.csv", index=False)
+dataset.close()
 
 # ========= // =============
 
@@ -99,3 +99,38 @@ class FloatingTextOverlay(QWidget):
                 self.anim_timer.stop()
                 self.hide()
         self.effect.setOpacity(current)
+
+
+class PerfOverlay(QLabel):
+    """Painel de desempenho (p50/p95/p99 e fps por estágio) - liga/desliga com F3"""
+    def __init__(self, parent, profiler):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("""
+            color: #7CFC00;
+            background-color: rgba(0, 0, 0, 170);
+            font-family: monospace;
+            font-size: 12px;
+            padding: 8px;
+        """)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(500)
+        self.refresh_timer.timeout.connect(self._refresh)
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.refresh_timer.stop()
+            self.hide()
+        else:
+            self._refresh()
+            self.show()
+            self.raise_()
+            self.refresh_timer.start()
+
+    def _refresh(self):
+        self.setText(self.profiler.format_summary())
+        self.adjustSize()
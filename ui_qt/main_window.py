@@ -1,11 +1,54 @@
 from PySide6.QtWidgets import QMainWindow, QWidget, QLabel, QGraphicsOpacityEffect, QFrame
 from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
-from PySide6.QtGui import QImage, QPixmap, QFont
-import cv2
+from PySide6.QtGui import QImage, QFont
+import time
 from enum import Enum
 
-from ui_qt.video_widget import VideoWidget
+import numpy as np
+
+from engine.log import get_logger
+from engine.profiler import profiler
+
+from ui_qt.video_decoder import VideoFrame
+from ui_qt.video_widget import VideoWidget, FrameView
 from ui_qt.menu_overlay import MenuOverlay
+from ui_qt.hud_overlay import PerfOverlay
+
+
+log = get_logger("ui")
+
+# Textos de intro e loop de cada FASE REAL (índice em app_qt.fases)
+# Mapeamento conforme app_qt.py:
+# 0: vídeo prólogo
+# 1: gesto_duplo (A+B) - "alianca" ← FASE REAL
+# 2: vídeo fase_1
+# 3: objeto (cat) - "boo" ← FASE REAL
+# 4: vídeo fase_2
+# 5: gesto_unico (A) - "estadio" ← FASE REAL
+# 6: vídeo fase_3
+FASES_REAIS = {
+    1: {
+        "date": "05 de Julho de 2025",
+        "emotional": "Me Mostra Sua Aliança ✋👈",
+        "title": "ALIANCA",
+        "subtitle": "Gestos: A + B",
+        "loop_file": "assets/ney1.mp4"  # ⚠️ Mude para loop da fase
+    },
+    3: {
+        "date": "13 de Novembro de 2025",
+        "emotional": "Me Mostra a Gata 🐈‍⬛",
+        "title": "BOO",
+        "subtitle": "Mostre: cat",
+        "loop_file": "assets/ney2.mp4"  # ⚠️ Mude para loop da fase
+    },
+    5: {
+        "date": "05 de Abril de 2025",
+        "emotional": "Grande Final",
+        "title": "ESTADIO",
+        "subtitle": "Gesto: A",
+        "loop_file": "assets/prolog.mp4"  # ⚠️ Mude para loop da fase
+    }
+}
 
 
 class TextState(Enum):
@@ -89,6 +132,7 @@ class MainWindow(QMainWindow):
         self.game = game
         self.current_phase_displayed = None
         self.menu_mode = True
+        self.models_ready = False  # ESPAÇO só começa o jogo depois de set_models_ready
         
         # ===== SISTEMA ROBUSTO DE CONTROLE DE TEXTOS =====
         self.text_state = TextState.IDLE
@@ -232,6 +276,23 @@ class MainWindow(QMainWindow):
             border: 3px solid #5a4a6a;
         """)
         self.cam_label.raise_()
+        # Desenha direto o QImage da miniatura feita na captura (sem QPixmap)
+        self.cam_border = 3
+        self.cam_view = FrameView(self.cam_label)
+        self.cam_view.setGeometry(
+            self.cam_border, self.cam_border,
+            self.cam_label.width() - 2 * self.cam_border,
+            self.cam_label.height() - 2 * self.cam_border
+        )
+        self._cam_fonte = None
+        self._cam_ultimo_idx = None
+        self._cam_buf = None  # cópia da miniatura que está na tela (só a GUI escreve)
+        self.cam_timer = QTimer(self)
+        self.cam_timer.timeout.connect(self._tick_cam)
+
+        # ----------------- DESEMPENHO (F3 mostra, F4 salva JSON) -----------------
+        self.perf_overlay = PerfOverlay(self.container, profiler)
+        self.perf_overlay.move(30, 110)
 
         self._update_positions()
 
@@ -274,44 +335,98 @@ class MainWindow(QMainWindow):
 
     # ----------------- TECLAS -----------------
     def keyPressEvent(self, e):
-        if self.menu_mode and e.key() == Qt.Key_Space:
-            print("\n[MENU] ESPAÇO PRESSIONADO - INICIANDO JOGO")
+        if self.menu_mode and self.models_ready and e.key() == Qt.Key_Space:
+            log.info("[MENU] ESPAÇO PRESSIONADO - INICIANDO JOGO")
             self.menu_mode = False
             self.menu_overlay.hide()
             self.memories_container.show()
             
-            # Para vídeo do menu
+            # Para vídeo do menu e já prepara o prólogo
             self.video.stop()
+            self._preload_next(-1)
             
             # Inicia game_logic
             self.game.start_game()
             
             # Mostra intro do prólogo (tela preta)
             self.start_phase_intro("2024 - 2025", "Um ano de momentos", "PROLOGO", "Assista")
+
+        if e.key() == Qt.Key_F3:
+            self.perf_overlay.toggle()
+        if e.key() == Qt.Key_F4:
+            path = profiler.dump_json(time.strftime("perf_%Y%m%d_%H%M%S.json"))
+            log.info("[PERF] Tempos salvos em %s", path)
             
         super().keyPressEvent(e)
 
+    def set_models_ready(self, ok=True):
+        """Modelos do engine carregados (engine.models.registry): libera o início"""
+        self.models_ready = True
+        self.menu_overlay.set_ready()
+        if not ok:
+            # O engine trata o detector que falhou como "nada detectado" (ver CVEngine._modelo)
+            log.error("[MODELOS] Algum modelo falhou; as fases que dependem dele não vão ser concluídas")
+
     # ----------------- CAMERA -----------------
-    def _show_cam(self, frame):
-        if frame is None:
+    def cam_preview_size(self):
+        """Tamanho útil do preview: a captura já entrega a miniatura nele"""
+        return self.cam_view.width(), self.cam_view.height()
+
+    def start_cam_preview(self, fonte, fps=30):
+        """
+        Atualiza o preview `fps` vezes por segundo com `fonte()` (o FramePacket
+        mais recente da captura), independente do ritmo da inferência.
+        `fps` <= 0 desliga o preview.
+        """
+        self._cam_fonte = fonte
+        self._cam_ultimo_idx = None
+        if fps <= 0:
+            self.cam_timer.stop()
+            self.cam_view.clear()
             return
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb.shape
-        img = QImage(rgb.data, w, h, ch*w, QImage.Format_RGB888)
-        pix = QPixmap.fromImage(img).scaled(
-            self.cam_label.width(),
-            self.cam_label.height(),
-            Qt.KeepAspectRatio
-        )
-        self.cam_label.setPixmap(pix)
+        self.cam_timer.start(max(1, round(1000 / fps)))
+
+    def _tick_cam(self):
+        packet = self._cam_fonte()
+        if packet is None or packet.idx == self._cam_ultimo_idx:
+            return  # Nada novo desde o último tick
+        self._cam_ultimo_idx = packet.idx
+        with profiler.stage("show_cam"):
+            self._show_cam(packet.preview)
+
+    def _show_cam(self, preview):
+        """`preview`: miniatura BGR do pipeline (FramePacket.preview)"""
+        if preview is None:
+            return
+        # O buffer do PreviewRing volta para a captura em poucos frames: com o
+        # preview mais lento que a câmera ele seria sobrescrito ainda na tela.
+        # Uma cópia por tick (miniatura pequena) num buffer só da GUI resolve
+        if self._cam_buf is None or self._cam_buf.shape != preview.shape:
+            self._cam_buf = np.empty_like(preview)
+        np.copyto(self._cam_buf, preview)
+        h, w = preview.shape[:2]
+        img = QImage(self._cam_buf.data, w, h, self._cam_buf.strides[0], QImage.Format_BGR888)
+        self.cam_view.set_frame(VideoFrame(None, img, self._cam_buf))
+
+    # ===== PRÉ-CARREGAMENTO =====
+    def _preload_next(self, fase_idx):
+        """Pré-carrega o próximo vídeo a tocar depois da fase `fase_idx`"""
+        proxima = fase_idx + 1
+        if proxima >= len(self.game.fases):
+            return
+        fase = self.game.fases[proxima]
+        if fase["tipo"] == "video":
+            self.video.preload(fase["arquivo"], loop=False)
+        elif proxima in FASES_REAIS:
+            self.video.preload(FASES_REAIS[proxima]["loop_file"], loop=True)
 
     # ===== VÍDEO TERMINOU =====
     def _on_video_finished(self):
         """Chamado quando vídeo (sem loop) termina"""
-        print(f"[VIDEO] Vídeo terminou (fase {self.game.fase_atual})")
+        log.info("[VIDEO] Vídeo terminou (fase %s)", self.game.fase_atual)
         fase_antes = self.game.fase_atual
         self.game.video_finished()
-        print(f"[VIDEO] Game avançou para fase {self.game.fase_atual}")
+        log.info("[VIDEO] Game avançou para fase %s", self.game.fase_atual)
         # Força re-detecção setando para fase anterior
         self.current_phase_displayed = fase_antes
 
@@ -319,11 +434,11 @@ class MainWindow(QMainWindow):
     def start_phase_intro(self, date_text, emotional_text, title_text, subtitle_text):
         """Inicia intro na tela preta"""
         if self.text_state != TextState.IDLE:
-            print(f"[WARN] Intro bloqueada - estado: {self.text_state.value}")
+            log.warning("Intro bloqueada - estado: %s", self.text_state.value)
             self.pending_intro = (date_text, emotional_text, title_text, subtitle_text)
             return
         
-        print(f"[INTRO] Iniciando: {title_text}")
+        log.info("[INTRO] Iniciando: %s", title_text)
         
         # Esconde floating_text se estiver visível (ex: "COMPLETO!" ainda aparecendo)
         self.floating_text.hide()
@@ -331,9 +446,9 @@ class MainWindow(QMainWindow):
         self._show_date(date_text, emotional_text, title_text, subtitle_text)
 
     def _show_date(self, date_text, emotional_text, title_text, subtitle_text):
-        print(f"[1/4] Data: {date_text}")
-        print(f"      → Próximo: Emocional '{emotional_text}'")
-        print(f"      → Depois: Título '{title_text}' | Sub '{subtitle_text}'")
+        log.info("[1/4] Data: %s", date_text)
+        log.info("      → Próximo: Emocional '%s'", emotional_text)
+        log.info("      → Depois: Título '%s' | Sub '%s'", title_text, subtitle_text)
         self.text_state = TextState.SHOWING_DATE
         self.date_overlay.setText(date_text)
         self.date_overlay.show()
@@ -352,7 +467,7 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(2000, lambda: self._fade_out_date(emotional_text, title_text, subtitle_text))
 
     def _fade_out_date(self, emotional_text, title_text, subtitle_text):
-        print("[1/4] → Fade out data...")
+        log.info("[1/4] → Fade out data...")
         effect = QGraphicsOpacityEffect(self.date_overlay)
         self.date_overlay.setGraphicsEffect(effect)
         
@@ -369,7 +484,7 @@ class MainWindow(QMainWindow):
         ])
 
     def _show_emotional(self, emotional_text, title_text, subtitle_text):
-        print(f"[2/4] Emocional: {emotional_text}")
+        log.info("[2/4] Emocional: %s", emotional_text)
         self.text_state = TextState.SHOWING_EMOTIONAL
         self.emotional_overlay.setText(emotional_text)
         self.emotional_overlay.show()
@@ -388,7 +503,7 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(2500, lambda: self._fade_out_emotional(title_text, subtitle_text))
 
     def _fade_out_emotional(self, title_text, subtitle_text):
-        print("[2/4] → Fade out emocional...")
+        log.info("[2/4] → Fade out emocional...")
         effect = QGraphicsOpacityEffect(self.emotional_overlay)
         self.emotional_overlay.setGraphicsEffect(effect)
         
@@ -405,7 +520,7 @@ class MainWindow(QMainWindow):
         ])
 
     def _show_title_center(self, title_text, subtitle_text):
-        print(f"[3/4] Título e subtítulo centralizados: {title_text} | {subtitle_text}")
+        log.info("[3/4] Título e subtítulo centralizados: %s | %s", title_text, subtitle_text)
         self.text_state = TextState.SHOWING_TITLE
         
         # Cria texto combinado com título maior e subtítulo menor
@@ -434,7 +549,7 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(2500, lambda: self._move_title_to_hud(title_text, subtitle_text))
 
     def _move_title_to_hud(self, title_text, subtitle_text):
-        print("[3/4] → Título sobe pro HUD...")
+        log.info("[3/4] → Título sobe pro HUD...")
         effect = QGraphicsOpacityEffect(self.floating_text)
         self.floating_text.setGraphicsEffect(effect)
         
@@ -454,7 +569,7 @@ class MainWindow(QMainWindow):
 
     def _show_hud_fixed(self, title_text, subtitle_text):
         """HUD aparece e PERMANECE PARA SEMPRE até próximo vídeo"""
-        print(f"[4/4] HUD: {title_text} | {subtitle_text}")
+        log.info("[4/4] HUD: %s | %s", title_text, subtitle_text)
         self.text_state = TextState.SHOWING_HUD
         
         self.hud_title.setText(title_text)
@@ -498,47 +613,47 @@ class MainWindow(QMainWindow):
         """Limpa efeitos do HUD e chama _finish_intro"""
         self.hud_bar.setGraphicsEffect(None)
         self.hud_bar.setStyleSheet("background-color: transparent;")
-        print(f"[HUD] ✓ Visível e fixo!")
-        print(f"      Título: '{self.hud_title.text()}'")
-        print(f"      Subtítulo: '{self.hud_subtitle.text()}'")
+        log.info("[HUD] ✓ Visível e fixo!")
+        log.info("      Título: '%s'", self.hud_title.text())
+        log.info("      Subtítulo: '%s'", self.hud_subtitle.text())
         self._finish_intro()
 
     def _finish_intro(self):
         """Libera sistema e inicia vídeo/gameplay"""
-        print("[✓] INTRO COMPLETA")
+        log.info("[✓] INTRO COMPLETA")
         self.text_state = TextState.IDLE
         
         # Se tem intro pendente na fila, executa
         if self.pending_intro:
             date, emo, title, sub = self.pending_intro
             self.pending_intro = None
-            print(f"[QUEUE] Executando pendente: {title}")
+            log.info("[QUEUE] Executando pendente: %s", title)
             QTimer.singleShot(100, lambda: self.start_phase_intro(date, emo, title, sub))
             return
         
         # Se game_logic está esperando intro do prólogo terminar
         if self.game.waiting_for_intro_complete:
-            print("[GAME] Notificando intro completa → iniciando prólogo")
+            log.info("[GAME] Notificando intro completa → iniciando prólogo")
             self.game.intro_completed()
             # Força detecção da fase 0 (prólogo) setando current_phase diferente
             self.current_phase_displayed = -1
-            print(f"[GAME] Fase agora é {self.game.fase_atual}, current_phase={self.current_phase_displayed}")
+            log.info("[GAME] Fase agora é %s, current_phase=%s", self.game.fase_atual, self.current_phase_displayed)
             return
         
         # Fases normais: inicia loop do corte
         if self.game.fase_atual >= 0 and self.game.fase_atual < len(self.game.fases):
             fase = self.game.fases[self.game.fase_atual]
             if fase["tipo"] != "video" and "loop_file" in fase:
-                print(f"[VIDEO] Loop do corte: {fase['loop_file']}")
+                log.info("[VIDEO] Loop do corte: %s", fase['loop_file'])
                 self.video.play_file(fase["loop_file"], loop=True)
 
     # ----------------- FLOATING TEXT -----------------
     def show_floating_text(self, text, duration=2000):
         if self.text_state != TextState.IDLE:
-            print(f"[WARN] Floating bloqueado")
+            log.warning("Floating bloqueado")
             return
         
-        print(f"[FLOATING] {text}")
+        log.info("[FLOATING] %s", text)
         self.floating_text.setText(text)
         self.floating_text.show()
         self.floating_text.raise_()
@@ -577,16 +692,14 @@ class MainWindow(QMainWindow):
             self.memories_count.setText(f"{unlocked}/3")
 
     # ----------------- UPDATE STATE -----------------
-    def update_state(self, game, dados, cam_frame, evento):
-        self._show_cam(cam_frame)
-        
+    def update_state(self, game, dados, evento):
         # Log se recebeu evento
         if evento:
-            print(f"[UPDATE_STATE] Evento recebido: '{evento}'")
+            log.debug("[UPDATE_STATE] Evento recebido: '%s'", evento)
         
         # Debug
         if game.fase_atual == 0 and self.current_phase_displayed != 0:
-            print(f"[DEBUG UPDATE] fase_atual={game.fase_atual}, current={self.current_phase_displayed}, menu={self.menu_mode}, waiting={game.waiting_for_intro_complete}")
+            log.debug("fase_atual=%s, current=%s, menu=%s, waiting=%s", game.fase_atual, self.current_phase_displayed, self.menu_mode, game.waiting_for_intro_complete)
         
         # Ignora durante menu ou intro
         if self.menu_mode or game.waiting_for_intro_complete:
@@ -595,7 +708,7 @@ class MainWindow(QMainWindow):
         # Jogo terminou
         if game.fase_atual >= len(game.fases):
             if self.current_phase_displayed != "FIM":
-                print("\n[JOGO] FINALIZADO!")
+                log.info("[JOGO] FINALIZADO!")
                 self.current_phase_displayed = "FIM"
             return
 
@@ -606,7 +719,7 @@ class MainWindow(QMainWindow):
             
             # Evita processar o mesmo evento múltiplas vezes
             if self.shown_complete_for_phase != fase_completada:
-                print(f"[EVENTO] Fase {fase_completada} OK! (agora em fase {game.fase_atual})")
+                log.info("[EVENTO] Fase %s OK! (agora em fase %s)", fase_completada, game.fase_atual)
                 self.shown_complete_for_phase = fase_completada
                 
                 # Para o loop antes de avançar para o vídeo da fase
@@ -615,10 +728,10 @@ class MainWindow(QMainWindow):
                 # Desbloqueia memória apenas nas FASES REAIS (1, 3, 5)
                 if fase_completada in [1, 3, 5]:
                     memory_index = {1: 0, 3: 1, 5: 2}[fase_completada]
-                    print(f"[MEMORIA] ✓ Desbloqueando cartinha {memory_index} (completou fase {fase_completada})")
+                    log.info("[MEMORIA] ✓ Desbloqueando cartinha %s (completou fase %s)", memory_index, fase_completada)
                     self.unlock_memory(memory_index)
                 else:
-                    print(f"[MEMORIA] Fase {fase_completada} não desbloqueia memória (não é fase real)")
+                    log.info("[MEMORIA] Fase %s não desbloqueia memória (não é fase real)", fase_completada)
                 
                 self.show_floating_text("COMPLETO!", 2500)
                 
@@ -629,56 +742,24 @@ class MainWindow(QMainWindow):
         # DEPOIS: Detecta mudança de fase (verifica se é diferente E se fase >= 0)
         if self.current_phase_displayed != game.fase_atual and game.fase_atual >= 0:
             fase = game.fases[game.fase_atual]
-            print(f"\n[FASE] {self.current_phase_displayed} → {game.fase_atual} ({fase['tipo']}) '{fase.get('nome', '?')}'")
+            log.info("[FASE] %s → %s (%s) '%s'", self.current_phase_displayed, game.fase_atual, fase['tipo'], fase.get('nome', '?'))
             
             self.shown_complete_for_phase = -1
             
             if fase["tipo"] == "video":
-                print(f"[FASE] Iniciando vídeo: {fase['arquivo']}")
+                log.info("[FASE] Iniciando vídeo: %s", fase['arquivo'])
                 # Para qualquer vídeo anterior
                 self.video.stop()
                 # Toca vídeo completo (sem loop)
                 self.video.play_file(fase["arquivo"], loop=False)
+                self._preload_next(game.fase_atual)
                 self.current_phase_displayed = game.fase_atual
                 return
             
             # FASES REAIS - mostra intro (tela preta) e PARA vídeo
-            # Mapeamento correto conforme app_qt.py:
-            # 0: vídeo prólogo
-            # 1: gesto_duplo (A+B) - "alianca" ← FASE REAL
-            # 2: vídeo fase_1
-            # 3: objeto (cat) - "boo" ← FASE REAL
-            # 4: vídeo fase_2
-            # 5: gesto_unico (A) - "estadio" ← FASE REAL
-            # 6: vídeo fase_3
-            
-            real_phases = {
-                1: {
-                    "date": "05 de Julho de 2025",
-                    "emotional": "Me Mostra Sua Aliança ✋👈",
-                    "title": "ALIANCA",
-                    "subtitle": "Gestos: A + B",
-                    "loop_file": "assets/ney1.mp4"  # ⚠️ Mude para loop da fase
-                },
-                3: {
-                    "date": "13 de Novembro de 2025",
-                    "emotional": "Me Mostra a Gata 🐈‍⬛",
-                    "title": "BOO",
-                    "subtitle": "Mostre: cat",
-                    "loop_file": "assets/ney2.mp4"  # ⚠️ Mude para loop da fase
-                },
-                5: {
-                    "date": "05 de Abril de 2025",
-                    "emotional": "Grande Final",
-                    "title": "ESTADIO",
-                    "subtitle": "Gesto: A",
-                    "loop_file": "assets/prolog.mp4"  # ⚠️ Mude para loop da fase
-                }
-            }
-            
-            if game.fase_atual in real_phases:
-                data = real_phases[game.fase_atual]
-                print(f"[FASE] Para vídeo e mostra intro para fase {game.fase_atual}")
+            if game.fase_atual in FASES_REAIS:
+                data = FASES_REAIS[game.fase_atual]
+                log.info("[FASE] Para vídeo e mostra intro para fase %s", game.fase_atual)
                 
                 # Para vídeo antes de mostrar intro
                 self.video.stop()
@@ -693,5 +774,8 @@ class MainWindow(QMainWindow):
                     data["title"],
                     data["subtitle"]
                 )
+
+                # Enquanto a intro roda, já abre o vídeo que vem depois desta fase
+                self._preload_next(game.fase_atual)
             
             self.current_phase_displayed = game.fase_atual
\ No newline at end of file
@@ -24,7 +24,8 @@ class MenuOverlay(QWidget):
         self.title.adjustSize()
 
         # ===== TEXTO PISCANDO =====
-        self.start_label = QLabel("PRESSIONE ESPACO", self)
+        # Começa em "CARREGANDO" até os modelos ficarem prontos (set_ready)
+        self.start_label = QLabel("CARREGANDO...", self)
         self.start_label.setFont(QFont("Press Start 2P", 12))
         self.start_label.setStyleSheet("""
             color: #B565D8;
@@ -46,6 +47,16 @@ class MenuOverlay(QWidget):
         self.anim.setLoopCount(-1)
         self.anim.start()
 
+    def set_ready(self):
+        self.start_label.setText("PRESSIONE ESPACO")
+        self._posicionar_start()
+
+    def _posicionar_start(self):
+        self.start_label.adjustSize()
+        start_x = (self.width() - self.start_label.width()) // 2
+        start_y = self.title.y() + self.title.height() + 60
+        self.start_label.move(start_x, start_y)
+
     def resizeEvent(self, event):
         w = self.width()
         h = self.height()
@@ -54,10 +65,7 @@ class MenuOverlay(QWidget):
         title_x = (w - self.title.width()) // 2
         title_y = h // 3
         self.title.move(title_x, title_y)
-        
-        self.start_label.adjustSize()
-        start_x = (w - self.start_label.width()) // 2
-        start_y = title_y + self.title.height() + 60
-        self.start_label.move(start_x, start_y)
+
+        self._posicionar_start()
         
         super().resizeEvent(event)
\ No newline at end of file
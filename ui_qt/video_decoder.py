@@ -0,0 +1,258 @@
+import math
+import queue
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from PySide6.QtGui import QImage
+
+
+END = object()  # Sinaliza fim do vídeo (sem loop)
+
+
+class VideoFrame:
+    """QImage pronto para desenhar + instante (s) em que deve aparecer"""
+    __slots__ = ("pts", "image", "buffer")
+
+    def __init__(self, pts, image, buffer):
+        self.pts = pts
+        self.image = image
+        self.buffer = buffer  # array por trás do QImage (mantém vivo)
+
+
+def fit_size(w, h, target_size):
+    """Maior (w, h) que cabe em target_size mantendo a proporção"""
+    tw, th = target_size
+    escala = min(tw / w, th / h)
+    return max(1, round(w * escala)), max(1, round(h * escala))
+
+
+class FramePool:
+    """
+    Buffers BGR reaproveitados em rodízio no tamanho final. Cada frame é
+    redimensionado direto num buffer do pool e embrulhado num QImage
+    (Format_BGR888) sem cópia, então a GUI só precisa desenhar.
+
+    O pool precisa ser maior que o número de frames em trânsito (fila +
+    o que está sendo escrito + o pendente + o que está na tela).
+    """
+    def __init__(self, tamanho, size):
+        w, h = size
+        self.size = size
+        self.buffers = [np.empty((h, w, 3), dtype=np.uint8) for _ in range(tamanho)]
+        self.pos = 0
+
+    def convert(self, frame):
+        buf = self.buffers[self.pos]
+        self.pos = (self.pos + 1) % len(self.buffers)
+        return to_qimage(frame, self.size, buf)
+
+
+def to_qimage(frame, size, buf=None):
+    """Redimensiona `frame` (BGR) para `size` em `buf` e devolve (QImage, buf)"""
+    h, w = frame.shape[:2]
+    if (w, h) == tuple(size):
+        buf = frame  # já no tamanho: o array do cap.read() é novo a cada frame
+    else:
+        interp = cv2.INTER_AREA if size[0] < w else cv2.INTER_LINEAR
+        buf = cv2.resize(frame, size, dst=buf, interpolation=interp)
+    image = QImage(buf.data, size[0], size[1], buf.strides[0], QImage.Format_BGR888)
+    return image, buf
+
+
+# -------- cache de clipes em loop --------
+class CachedClip:
+    """Todos os frames de um clipe curto já prontos na memória"""
+    __slots__ = ("frames", "duracao", "nbytes")
+
+    def __init__(self, frames, duracao):
+        self.frames = frames
+        self.duracao = duracao
+        self.nbytes = sum(f.buffer.nbytes for f in frames)
+
+
+class ClipCache:
+    """
+    LRU de clipes decodificados com orçamento de memória. Um clipe só entra
+    se ocupar no máximo `max_fraction` do orçamento; para caber, os menos
+    usados recentemente saem.
+    """
+    def __init__(self, budget_mb=300, max_fraction=0.5):
+        self.budget = budget_mb * 2**20
+        self.max_fraction = max_fraction
+        self.nbytes = 0
+        self._clips = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fits(self, nbytes):
+        return 0 < nbytes <= self.budget * self.max_fraction
+
+    def get(self, key):
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is not None:
+                self._clips.move_to_end(key)
+            return clip
+
+    def put(self, key, clip):
+        if not self.fits(clip.nbytes):
+            return False
+        with self._lock:
+            antigo = self._clips.pop(key, None)
+            if antigo is not None:
+                self.nbytes -= antigo.nbytes
+            while self._clips and self.nbytes + clip.nbytes > self.budget:
+                _, removido = self._clips.popitem(last=False)
+                self.nbytes -= removido.nbytes
+            self._clips[key] = clip
+            self.nbytes += clip.nbytes
+        return True
+
+
+class CachedClipSource:
+    """Toca um CachedClip em loop direto da RAM (mesma interface do VideoDecoder)"""
+    def __init__(self, clip, pts_base=0.0):
+        self.clip = clip
+        self._pos = 0
+        self._pts_base = pts_base
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def join(self, timeout=None):
+        pass
+
+    def read(self):
+        f = self.clip.frames[self._pos]
+        frame = VideoFrame(self._pts_base + f.pts, f.image, f.buffer)
+        self._pos += 1
+        if self._pos == len(self.clip.frames):
+            self._pos = 0
+            self._pts_base += self.clip.duracao
+        return frame
+
+
+# Compartilhado por todos os VideoWidget
+clip_cache = ClipCache()
+
+
+class VideoDecoder(threading.Thread):
+    """
+    Decodifica o vídeo numa thread própria, lendo à frente numa fila limitada.
+
+    Os frames saem com o `pts` do próprio stream (índice / FPS do arquivo),
+    contínuo entre voltas do loop; quem apresenta decide quando mostrar.
+    Com `target_size` cada frame já sai redimensionado (mantendo proporção)
+    e pronto como QImage, então nada de conversão/escala na GUI.
+    `buffer_seconds` aumenta a fila para caber esse tempo de vídeo (usado
+    para pré-carregar o próximo vídeo antes de ele entrar).
+
+    Com `cache`, um clipe em loop que caiba no orçamento é guardado inteiro
+    durante a primeira volta (em `cache_scale` do tamanho, se < 1); as voltas
+    seguintes saem da RAM, sem decodificar nem fazer seek.
+    """
+    def __init__(self, path, loop=True, buffer_frames=8, target_size=None, buffer_seconds=None,
+                 cache=None, cache_key=None, cache_scale=1.0):
+        super().__init__(name=f"decoder:{path}", daemon=True)
+        self.path = path
+        self.loop = loop
+        self.target_size = target_size
+        self.buffer_seconds = buffer_seconds
+        self.cache = cache if loop else None
+        self.cache_key = cache_key
+        self.cache_scale = cache_scale
+        self.fps = None
+        self.queue = queue.Queue(maxsize=buffer_frames)
+        self._stop_event = threading.Event()
+
+    # -------- consumidor (GUI) --------
+    def read(self):
+        """Próximo frame já decodificado, END, ou None se ainda não tem"""
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        self._stop_event.set()
+        # Libera um put() bloqueado com a fila cheia
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    # -------- thread --------
+    def run(self):
+        cap = cv2.VideoCapture(self.path)
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        if self.buffer_seconds:
+            # Antes do primeiro put: Queue lê maxsize a cada put
+            self.queue.maxsize = max(self.queue.maxsize, math.ceil(self.buffer_seconds * self.fps))
+        n_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        pts_base = 0.0
+        idx = 0
+        size = None
+        pool = None
+        gravando = None  # frames da 1ª volta, quando o clipe vai para o cache
+        try:
+            while not self._stop_event.is_set():
+                ok, frame = cap.read()
+                if not ok:
+                    if self.loop and idx > 0:
+                        if gravando is not None:
+                            clip = CachedClip(gravando, idx / self.fps)
+                            self.cache.put(self.cache_key, clip)
+                            cap.release()
+                            self._play_cached(clip)
+                            return
+                        # Seek fica na thread do decoder: se travar, não trava a GUI
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        pts_base += idx / self.fps
+                        idx = 0
+                        continue
+                    self._put(END)
+                    return
+
+                if size is None:
+                    h, w = frame.shape[:2]
+                    size = fit_size(w, h, self.target_size) if self.target_size else (w, h)
+                    if self.cache is not None:
+                        reduzido = fit_size(w, h, (size[0] * self.cache_scale, size[1] * self.cache_scale))
+                        if self.cache.fits(n_frames * reduzido[0] * reduzido[1] * 3):
+                            size = reduzido
+                            gravando = []
+                    if gravando is None:
+                        pool = FramePool(self.queue.maxsize + 3, size)
+
+                if gravando is not None:
+                    # Buffer próprio por frame: ele fica no cache
+                    image, buf = to_qimage(frame, size)
+                    gravando.append(VideoFrame(idx / self.fps, image, buf))
+                    if not self.cache.fits((len(gravando) + 1) * buf.nbytes):
+                        # FRAME_COUNT mentiu: desiste do cache e volta ao pool
+                        gravando = None
+                        pool = FramePool(self.queue.maxsize + 3, size)
+                else:
+                    image, buf = pool.convert(frame)
+                self._put(VideoFrame(pts_base + idx / self.fps, image, buf))
+                idx += 1
+        finally:
+            cap.release()
+
+    def _play_cached(self, clip):
+        fonte = CachedClipSource(clip, pts_base=clip.duracao)
+        while not self._stop_event.is_set():
+            self._put(fonte.read())
+
+    def _put(self, item):
+        while not self._stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
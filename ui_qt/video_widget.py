@@ -1,11 +1,54 @@
-import cv2
-from PySide6.QtWidgets import QLabel, QFrame
-from PySide6.QtGui import QImage, QPixmap
-from PySide6.QtCore import QTimer, Qt, Signal
+import time
+from collections import OrderedDict
+
+from PySide6.QtWidgets import QFrame, QWidget
+from PySide6.QtGui import QPainter
+from PySide6.QtCore import QRect, QTimer, Qt, Signal
+
+from engine.log import get_logger
+from ui_qt.video_decoder import VideoDecoder, CachedClipSource, END, clip_cache, fit_size
+
+log = get_logger("ui.video")
+
+
+class FrameView(QWidget):
+    """Desenha o QImage pronto do decoder, centralizado, sem passar por QPixmap"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._frame = None  # VideoFrame: guarda também o array por trás do QImage
+
+    def set_frame(self, frame):
+        self._frame = frame
+        self.update()
+
+    def clear(self):
+        self._frame = None
+        self.update()
+
+    def paintEvent(self, event):
+        if self._frame is None:
+            return
+        image = self._frame.image
+        painter = QPainter(self)
+        w, h = fit_size(image.width(), image.height(), (self.width(), self.height()))
+        x = (self.width() - w) // 2
+        y = (self.height() - h) // 2
+        if (w, h) == (image.width(), image.height()):
+            painter.drawImage(x, y, image)
+        else:
+            # Frame menor que a tela (clipe guardado em escala reduzida no cache)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(QRect(x, y, w, h), image)
+        painter.end()
 
 
 class VideoWidget(QFrame):
     finished = Signal()  # Sinal emitido quando vídeo termina (sem loop)
+
+    TICK_MS = 8  # Frequência de checagem; o ritmo real vem do pts de cada frame
+    PRELOAD_SECONDS = 1.0  # Quanto do começo de um vídeo pré-carregado fica decodificado
+    MAX_PRELOADS = 2
+    CACHE_SCALE = 1.0  # < 1 guarda clipes em loop menores no cache (escala na hora de desenhar)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -17,63 +60,129 @@ class VideoWidget(QFrame):
             }
         """)
 
-        self.label = QLabel(self)
-        self.label.setAlignment(Qt.AlignCenter)
-        self.label.setGeometry(0, 0, self.width(), self.height())
+        self.view = FrameView(self)
+        self.view.setGeometry(0, 0, self.width(), self.height())
 
-        self.cap = None
+        self.decoder = None
+        self._preloaded = OrderedDict()  # (path, loop) → VideoDecoder já rodando
         self.loop = True
         self.video_finished_emitted = False
+        self.frames_descartados = 0
+
+        self._pendente = None   # próximo frame, ainda não chegou a hora
+        self._relogio = None    # monotonic() correspondente a pts = 0
 
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self._next_frame)
 
     def resizeEvent(self, event):
-        self.label.setGeometry(0, 0, self.width(), self.height())
+        self.view.setGeometry(0, 0, self.width(), self.height())
         super().resizeEvent(event)
 
     def play_file(self, path, loop=True):
-        if self.cap:
-            self.cap.release()
-        self.cap = cv2.VideoCapture(path)
+        self._stop_decoder()
+        self.decoder = self._preloaded.pop((path, loop), None)
+        preloaded = self.decoder is not None
+        if not preloaded:
+            self.decoder = self._new_decoder(path, loop)
         self.loop = loop
         self.video_finished_emitted = False
-        self.timer.start(33)
-        print(f"[VIDEO] Iniciando {path} - loop={loop}")
+        self.timer.start(self.TICK_MS)
+        log.info("[VIDEO] Iniciando %s - loop=%s - pré-carregado=%s", path, loop, preloaded)
+        # Pré-carregado já tem frames prontos: mostra o primeiro agora, sem tela vazia
+        self._next_frame()
+
+    def preload(self, path, loop=True):
+        """Abre `path` em background e decodifica o primeiro segundo para o próximo play_file"""
+        if (path, loop) in self._preloaded:
+            return
+        self._preloaded[(path, loop)] = self._new_decoder(path, loop, buffer_seconds=self.PRELOAD_SECONDS)
+        while len(self._preloaded) > self.MAX_PRELOADS:
+            _, antigo = self._preloaded.popitem(last=False)
+            antigo.stop()
+        log.info("[VIDEO] Pré-carregando %s - loop=%s", path, loop)
+
+    def _new_decoder(self, path, loop, buffer_seconds=None):
+        target_size = (self.width(), self.height())
+        cache_key = (path, target_size, self.CACHE_SCALE)
+        if loop:
+            clip = clip_cache.get(cache_key)
+            if clip is not None:
+                # Loop já decodificado: toca da RAM, sem thread nem disco
+                log.debug("[VIDEO] %s do cache (%.0f MB)", path, clip.nbytes / 2**20)
+                return CachedClipSource(clip)
+        # O decoder já entrega no tamanho do widget (ex.: 800x800 do MainWindow)
+        decoder = VideoDecoder(
+            path, loop=loop,
+            target_size=target_size,
+            buffer_seconds=buffer_seconds,
+            cache=clip_cache, cache_key=cache_key, cache_scale=self.CACHE_SCALE
+        )
+        decoder.start()
+        return decoder
 
     def stop(self):
         """Para o vídeo"""
         self.timer.stop()
-        if self.cap:
-            self.cap.release()
-            self.cap = None
-        self.label.clear()
+        self._stop_decoder()
+        self.view.clear()
+
+    def shutdown(self):
+        """Para o vídeo atual e os pré-carregados, esperando as threads saírem"""
+        decoders = list(self._preloaded.values())
+        if self.decoder:
+            decoders.append(self.decoder)
+        self.stop()
+        self._preloaded.clear()
+        for decoder in decoders:
+            decoder.stop()
+            decoder.join(0.5)
+
+    def _stop_decoder(self):
+        if self.decoder:
+            self.decoder.stop()
+            self.decoder = None
+        self._pendente = None
+        self._relogio = None
 
     def _next_frame(self):
-        if not self.cap:
+        if not self.decoder:
             return
-        ok, frame = self.cap.read()
-        if not ok:
-            if self.loop:
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                return
-            else:
-                # Vídeo terminou (sem loop)
-                print("[VIDEO] Terminou (sem loop)")
-                self.timer.stop()
-                if not self.video_finished_emitted:
-                    self.video_finished_emitted = True
-                    self.finished.emit()
-                return
+        if self._pendente is None:
+            self._pendente = self.decoder.read()
+            if self._pendente is None:
+                return  # decoder ainda não entregou
+
+        if self._pendente is END:
+            # Vídeo terminou (sem loop)
+            log.info("[VIDEO] Terminou (sem loop)")
+            self.timer.stop()
+            self._stop_decoder()
+            if not self.video_finished_emitted:
+                self.video_finished_emitted = True
+                self.finished.emit()
+            return
+
+        agora = time.monotonic()
+        if self._relogio is None:
+            self._relogio = agora - self._pendente.pts
+        t = agora - self._relogio
+        if self._pendente.pts > t:
+            return
+
+        # Se mais de um frame já passou da hora, mostra só o mais novo (sem drift)
+        frame, self._pendente = self._pendente, None
+        while True:
+            proximo = self.decoder.read()
+            if proximo is None:
+                break
+            if proximo is END or proximo.pts > t:
+                self._pendente = proximo
+                break
+            self.frames_descartados += 1
+            frame = proximo
         self._show_frame(frame)
 
     def _show_frame(self, frame):
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb.shape
-        img = QImage(rgb.data, w, h, ch*w, QImage.Format_RGB888)
-        pix = QPixmap.fromImage(img).scaled(
-            self.width(), self.height(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        self.label.setPixmap(pix)
\ No newline at end of file
+        self.view.set_frame(frame)